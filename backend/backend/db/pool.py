@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections.
+
+    ``connect`` opens a new connection and ``ping`` (optional) returns whether
+    an idle connection is still usable before it is handed out again. Idle
+    connections beyond ``min_size`` are closed after ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        connect,
+        min_size=0,
+        max_size=10,
+        idle_timeout=300,
+        timeout=5,
+        ping=None,
+    ):
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.ping = ping
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._counters = {
+            "acquired": 0,
+            "connects": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "ping_failures": 0,
+        }
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _reap(self):
+        expired = []
+        now = time.monotonic()
+        with self._cond:
+            while (
+                self._idle
+                and self._size > self.min_size
+                and now - self._idle[0][1] > self.idle_timeout
+            ):
+                expired.append(self._idle.popleft()[0])
+                self._size -= 1
+        for conn in expired:
+            self._close_quietly(conn)
+
+    def _open(self):
+        try:
+            conn = self.connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters["connects"] += 1
+        return conn
+
+    def acquire(self):
+        self._reap()
+        start = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()[0]
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available within {self.timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+            self._in_use += 1
+            self._counters["acquired"] += 1
+            if waited:
+                self._counters["waits"] += 1
+                self._counters["wait_seconds"] += time.monotonic() - start
+
+        if conn is None:
+            return self._open()
+        if self.ping is not None and not self._ping(conn):
+            with self._cond:
+                self._counters["ping_failures"] += 1
+            self._close_quietly(conn)
+            return self._open()
+        return conn
+
+    def _ping(self, conn):
+        try:
+            return bool(self.ping(conn))
+        except Exception:
+            return False
+
+    def release(self, conn, discard=False):
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if discard:
+            self._close_quietly(conn)
+
+    def close(self):
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self._counters,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, connect, options):
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                connect,
+                min_size=options.get("MIN_SIZE", 0),
+                max_size=options.get("MAX_SIZE", 10),
+                idle_timeout=options.get("IDLE_TIMEOUT", 300),
+                timeout=options.get("TIMEOUT", 5),
+                ping=options.get("PING"),
+            )
+        return pool
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = dict(_pools)
+    return {key: pool.stats() for key, pool in pools.items()}
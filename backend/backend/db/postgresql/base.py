@@ -0,0 +1,48 @@
+import functools
+
+from django.db.backends.postgresql import base
+
+from backend.db.pool import get_pool
+
+
+def ping(conn):
+    if conn.closed:
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    if not conn.autocommit:
+        conn.rollback()
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend that borrows connections from a process-wide pool.
+
+    Configure with a ``POOL`` dict next to ``ENGINE`` in ``DATABASES``; keep
+    ``CONN_MAX_AGE`` at 0 so connections go back to the pool after each request.
+    """
+
+    def get_pool(self, conn_params):
+        options = dict(self.settings_dict.get("POOL") or {})
+        if options.pop("PRE_PING", True):
+            options["PING"] = ping
+        connect = functools.partial(
+            base.DatabaseWrapper.get_new_connection, self, conn_params
+        )
+        return get_pool((self.alias, self.settings_dict["NAME"]), connect, options)
+
+    def get_new_connection(self, conn_params):
+        self._pool = self.get_pool(conn_params)
+        return self._pool.acquire()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # Connections still referenced by an atomic block cannot be shared.
+        discard = self.in_atomic_block or self.connection.closed
+        if not discard:
+            try:
+                self.connection.rollback()
+            except self.Database.Error:
+                discard = True
+        self._pool.release(self.connection, discard=discard)
@@ -0,0 +1,274 @@
+import contextvars
+import hashlib
+import heapq
+import random
+import uuid
+from itertools import chain, islice
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+_pinned = contextvars.ContextVar("pinned_to_primary", default=False)
+
+
+def pin_to_primary():
+    _pinned.set(True)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def reset_pin():
+    _pinned.set(False)
+
+
+def _sticky_key(user_id):
+    return f"db:sticky:{user_id}"
+
+
+def _sticky_cache():
+    return caches[getattr(settings, "DATABASE_REPLICA_STICKY_CACHE_ALIAS", "default")]
+
+
+def stick_user(user_id):
+    """Send ``user_id``'s reads to primary for the next few seconds."""
+    seconds = getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5)
+    if seconds > 0:
+        _sticky_cache().set(_sticky_key(user_id), True, seconds)
+
+
+def is_sticky(user_id):
+    return bool(_sticky_cache().get(_sticky_key(user_id)))
+
+
+def pin_if_sticky(user_id):
+    if getattr(settings, "DATABASE_REPLICAS", []) and is_sticky(user_id):
+        pin_to_primary()
+
+
+def shard_aliases():
+    return getattr(settings, "DATABASE_SHARDS", [])
+
+
+def jump_hash(key, buckets):
+    """Lamping & Veach jump consistent hash of a 64-bit ``key``.
+
+    Growing ``buckets`` from N to N + 1 moves only ~1/(N + 1) of the keys,
+    all of them into the new bucket.
+    """
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * (1 << 31) / ((key >> 33) + 1))
+    return bucket
+
+
+def _org_digest(org_id):
+    return hashlib.blake2b(uuid.UUID(str(org_id)).bytes, digest_size=8).digest()
+
+
+def shard_for(org_id):
+    """Alias holding organisation ``org_id``, or None when sharding is off."""
+    shards = shard_aliases()
+    if not shards:
+        return None
+    try:
+        key = int.from_bytes(_org_digest(org_id), "big")
+    except ValueError:
+        return None
+    return shards[jump_hash(key, len(shards))]
+
+
+def group_by_shard(items, key):
+    """``{alias: [item, ...]}`` by ``shard_for(key(item))``.
+
+    Everything lands in a single ``None`` group when sharding is off, so
+    callers can pass the alias straight to ``using()``.
+    """
+    groups = {}
+    for item in items:
+        groups.setdefault(shard_for(key(item)), []).append(item)
+    return groups
+
+
+def shard_of(instance):
+    """The shard ``instance`` was loaded from, or None for routed databases."""
+    db = instance._state.db
+    return db if db in shard_aliases() else None
+
+
+def each_shard(queryset):
+    """``queryset`` bound to every shard, or just ``[queryset]`` when unsharded.
+
+    Querysets of models that are not sharded are returned as they are.
+    """
+    shards = shard_aliases()
+    if not shards or queryset.model._meta.label_lower not in ShardRouter.sharded:
+        return [queryset]
+    return [queryset.using(alias) for alias in shards]
+
+
+def scatter(queryset, key=None, limit=None):
+    """Evaluate ``queryset`` on every shard and merge the rows.
+
+    With ``key``, each shard's rows must already be ordered by it and the
+    merge keeps that order; ``limit`` then caps every shard and the result.
+    """
+    querysets = each_shard(queryset)
+    if limit is not None:
+        querysets = [qs[:limit] for qs in querysets]
+    if len(querysets) == 1:
+        return list(querysets[0])
+    if key is None:
+        rows = chain.from_iterable(querysets)
+    else:
+        rows = heapq.merge(*(list(qs) for qs in querysets), key=key)
+    return list(islice(rows, limit))
+
+
+def shard_pk(org_id):
+    # Shards allocate ids independently; derive a 63-bit one from orgId so
+    # primary keys stay unique across shards (the membership index keys on it).
+    return int.from_bytes(_org_digest(org_id), "big") >> 1
+
+
+class ShardRoutingError(RuntimeError):
+    pass
+
+
+class ShardRouter:
+    """Place organisations and their memberships on ``settings.DATABASE_SHARDS``.
+
+    Users and every other model stay on ``default``. Organisation queries are
+    routed by an Organisation instance hint (``save()``, its related managers,
+    deletes) or by ``using(shard_for(org_id))``; queries spanning shards go
+    through ``each_shard``/``scatter``. Anything else raises rather than
+    silently reading or writing ``default``.
+    """
+
+    sharded = ("users.organisation", "users.organisation_users")
+
+    def _db(self, model, **hints):
+        if not shard_aliases():
+            return None
+        instance = hints.get("instance")
+        from_organisation = (
+            instance is not None and instance._meta.label_lower == self.sharded[0]
+        )
+        if model._meta.label_lower not in self.sharded:
+            if from_organisation:
+                # organisation.users joins the shard's memberships to users.
+                raise ShardRoutingError(
+                    f"{model._meta.label} rows cannot be joined to memberships "
+                    "on a shard; look up the member ids on the shard first."
+                )
+            return None
+        if from_organisation:
+            return instance._state.db or shard_for(instance.orgId)
+        raise ShardRoutingError(
+            f"Cannot pick a shard for this {model._meta.label} query; use "
+            "using(shard_for(orgId)), an Organisation instance or each_shard()."
+        )
+
+    db_for_read = _db
+    db_for_write = _db
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Memberships point at users on ``default`` from their shard.
+        labels = {"users.user", *self.sharded}
+        if (
+            shard_aliases()
+            and {
+                obj1._meta.label_lower,
+                obj2._meta.label_lower,
+            }
+            <= labels
+        ):
+            return True
+        return None
+
+
+class ReplicaRouter:
+    """Route reads to ``settings.DATABASE_REPLICAS`` and writes to ``default``.
+
+    Once a write is routed in the current request, or the request belongs to
+    a user marked with ``stick_user``, reads stay on ``default`` as well.
+    """
+
+    primary = "default"
+
+    @property
+    def replicas(self):
+        return getattr(settings, "DATABASE_REPLICAS", [])
+
+    def db_for_read(self, model, **hints):
+        replicas = self.replicas
+        if not replicas or is_pinned():
+            return self.primary if replicas else None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if not self.replicas:
+            return None
+        pin_to_primary()
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {self.primary, *self.replicas}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in self.replicas:
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """Reset the per-request pin and make authenticated writers sticky.
+
+    Runs natively under ASGI so the pin set by async views (whose queries go
+    through ``sync_to_async``, which copies context back) is seen here.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = _pinned.set(False)
+        try:
+            response = self.get_response(request)
+            if is_pinned():
+                self.stick(request)
+            return response
+        finally:
+            _pinned.reset(token)
+
+    async def __acall__(self, request):
+        token = _pinned.set(False)
+        try:
+            response = await self.get_response(request)
+            if is_pinned():
+                # request.user may be lazy and hit the database.
+                await sync_to_async(self.stick)(request)
+            return response
+        finally:
+            _pinned.reset(token)
+
+    @staticmethod
+    def stick(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            stick_user(user.pk)
@@ -1,6 +1,7 @@
 import os
 import dj_database_url
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,7 +29,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "users.metrics.MetricsMiddleware",
+    "users.concurrency.ConcurrencyLimitMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "backend.db.routers.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -55,13 +59,125 @@ TEMPLATES = [
     },
 ]
 
+# API-only mode drops the apps and middleware that only serve the admin site
+# and browser sessions, so new workers import and initialise less.
+API_ONLY = os.environ.get("API_ONLY", "").lower() in ("1", "true", "yes")
+
+if API_ONLY:
+    INSTALLED_APPS = [
+        app
+        for app in INSTALLED_APPS
+        if app
+        not in (
+            "django.contrib.admin",
+            "django.contrib.sessions",
+            "django.contrib.messages",
+            "django.contrib.staticfiles",
+        )
+    ]
+    MIDDLEWARE = [
+        middleware
+        for middleware in MIDDLEWARE
+        if middleware
+        not in (
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.middleware.csrf.CsrfViewMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+        )
+    ]
+    TEMPLATES[0]["OPTIONS"]["context_processors"].remove(
+        "django.contrib.messages.context_processors.messages"
+    )
+
 WSGI_APPLICATION = "backend.wsgi.application"
 
+# Serve the hot users endpoints from async views (run under backend.asgi).
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "").lower() in ("1", "true", "yes")
+
 
 DATABASES = {"default": dj_database_url.parse(os.environ.get("DATABASE_URL"))}
 
+if os.environ.get("DATABASE_POOL", "").lower() in ("1", "true", "yes"):
+    DATABASES["default"].update(
+        {
+            "ENGINE": "backend.db.postgresql",
+            "CONN_MAX_AGE": 0,
+            "POOL": {
+                "MIN_SIZE": int(os.environ.get("DATABASE_POOL_MIN_SIZE", 1)),
+                "MAX_SIZE": int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10)),
+                "IDLE_TIMEOUT": float(
+                    os.environ.get("DATABASE_POOL_IDLE_TIMEOUT", 300)
+                ),
+                "TIMEOUT": float(os.environ.get("DATABASE_POOL_TIMEOUT", 5)),
+                "PRE_PING": True,
+            },
+        }
+    )
+
+DATABASE_REPLICAS = []
+for index, url in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(","))
+):
+    alias = f"replica_{index}"
+    DATABASES[alias] = dj_database_url.parse(url.strip())
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(alias)
+
+# Organisations and memberships are spread over these aliases by orgId (see
+# backend.db.routers.ShardRouter); users stay on ``default``.
+DATABASE_SHARDS = []
+for index, url in enumerate(
+    filter(None, os.environ.get("DATABASE_SHARD_URLS", "").split(","))
+):
+    alias = f"shard_{index}"
+    DATABASES[alias] = dj_database_url.parse(url.strip())
+    DATABASE_SHARDS.append(alias)
+
+DATABASE_ROUTERS = [
+    "backend.db.routers.ShardRouter",
+    "backend.db.routers.ReplicaRouter",
+]
+DATABASE_REPLICA_STICKY_SECONDS = int(
+    os.environ.get("DATABASE_REPLICA_STICKY_SECONDS", 5)
+)
+
+# "default" is per process; state other workers must see lives in "shared"
+# when SHARED_CACHE_URL (e.g. redis://host:6379/0) is set.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+if os.environ.get("SHARED_CACHE_URL"):
+    CACHES["shared"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["SHARED_CACHE_URL"],
+    }
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+DATABASE_REPLICA_STICKY_CACHE_ALIAS = os.environ.get(
+    "DATABASE_REPLICA_STICKY_CACHE_ALIAS", "shared" if "shared" in CACHES else "default"
+)
+if (
+    DATABASE_REPLICAS
+    and CACHES[DATABASE_REPLICA_STICKY_CACHE_ALIAS]["BACKEND"] in PROCESS_LOCAL_CACHES
+):
+    # A worker that did not serve the write would read a stale replica.
+    raise ImproperlyConfigured(
+        "DATABASE_REPLICA_URLS needs a cache shared by all workers for "
+        "read-your-writes stickiness; set SHARED_CACHE_URL."
+    )
+
 AUTH_USER_MODEL = "users.User"
 
+AUTHENTICATION_BACKENDS = ["users.backends.PooledModelBackend"]
+
+PASSWORD_HASHING = {
+    "WORKERS": int(os.environ.get("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)),
+    "MAX_PENDING": int(os.environ.get("PASSWORD_HASHING_MAX_PENDING", 64)),
+    "TIMEOUT": float(os.environ.get("PASSWORD_HASHING_TIMEOUT", 5)),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -90,11 +206,144 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # Trusted proxies in front of the app; 0 keys client IPs on REMOTE_ADDR so a
+    # spoofed X-Forwarded-For cannot dodge the login throttle.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),
+}
+
+# Opt-in: FastJSONRenderer differs from JSONRenderer on floats (see its docstring).
+if os.environ.get("FAST_JSON", "").lower() in ("1", "true", "yes"):
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "users.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "users.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
+if API_ONLY:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = tuple(
+        renderer
+        for renderer in REST_FRAMEWORK.get(
+            "DEFAULT_RENDERER_CLASSES", ("rest_framework.renderers.JSONRenderer",)
+        )
+        if renderer != "rest_framework.renderers.BrowsableAPIRenderer"
+    )
+
+# Scrapes need the bearer token when one is set, else a loopback address.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN") or None
+METRICS_ALLOWED_IPS = list(
+    filter(None, os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(","))
+)
+METRICS_DEBUG_HEADER = DEBUG
+
+USER_AUTH_CACHE = {
+    "MAX_SIZE": int(os.environ.get("USER_AUTH_CACHE_SIZE", 10000)),
+    "TTL": int(os.environ.get("USER_AUTH_CACHE_TTL", 60)),
+    "CACHE_ALIAS": os.environ.get("USER_AUTH_CACHE_ALIAS") or None,
+    # Each worker's in-memory copy; only the shared tier sees other workers'
+    # invalidations.
+    "LOCAL_TTL": int(os.environ.get("USER_AUTH_CACHE_LOCAL_TTL", 5)),
+}
+if (
+    USER_AUTH_CACHE["CACHE_ALIAS"] is None
+    or CACHES[USER_AUTH_CACHE["CACHE_ALIAS"]]["BACKEND"] in PROCESS_LOCAL_CACHES
+):
+    # Deactivation and demotion only evict this worker's copy; bound how long
+    # the others keep authenticating with stale is_active/is_staff flags.
+    USER_AUTH_CACHE["TTL"] = min(USER_AUTH_CACHE["TTL"], 5)
+MEMBERSHIP_INDEX = {
+    "MAX_SIZE": int(os.environ.get("MEMBERSHIP_INDEX_SIZE", 100000)),
+    "TTL": int(os.environ.get("MEMBERSHIP_INDEX_TTL", 5)),
+}
+# The index is per process and only this worker's signals patch it; bound how
+# long a membership removed elsewhere keeps granting access.
+MEMBERSHIP_INDEX["TTL"] = min(MEMBERSHIP_INDEX["TTL"], 5)
+LOGIN_THROTTLE = {
+    "ENABLED": os.environ.get("LOGIN_THROTTLE", "1").lower() in ("1", "true", "yes"),
+    "EMAIL_RATE": os.environ.get("LOGIN_THROTTLE_EMAIL_RATE", "5/min"),
+    "IP_RATE": os.environ.get("LOGIN_THROTTLE_IP_RATE", "30/min"),
+    "SHARDS": 16,
+    "CACHE_ALIAS": os.environ.get("LOGIN_THROTTLE_CACHE_ALIAS") or None,
+}
+TOKEN_REVOCATION = {
+    "REBUILD_INTERVAL": int(os.environ.get("TOKEN_REVOCATION_REBUILD_INTERVAL", 30)),
+    "CAPACITY": int(os.environ.get("TOKEN_REVOCATION_CAPACITY", 100000)),
+    "ERROR_RATE": float(os.environ.get("TOKEN_REVOCATION_ERROR_RATE", 0.001)),
+    "CONFIRM_CACHE_SIZE": 10000,
+}
+SEARCH = {
+    # "auto" uses the pg_trgm indexes on PostgreSQL and the in-process
+    # trigram index elsewhere; "database" or "ngram" force one of them.
+    "BACKEND": os.environ.get("SEARCH_BACKEND", "auto"),
+    "DEFAULT_LIMIT": 20,
+    "MAX_LIMIT": 100,
+    "NGRAM_TTL": int(os.environ.get("SEARCH_NGRAM_TTL", 300)),
+}
+REPRESENTATION_CACHE = {
+    "CACHE_ALIAS": os.environ.get(
+        "REPRESENTATION_CACHE_ALIAS", "shared" if "shared" in CACHES else "default"
+    ),
+    "TTL": int(os.environ.get("REPRESENTATION_CACHE_TTL", 300)),
+}
+if CACHES[REPRESENTATION_CACHE["CACHE_ALIAS"]]["BACKEND"] in PROCESS_LOCAL_CACHES:
+    # Save/delete signals only invalidate this worker's copy; bound how long
+    # the others can serve a stale representation.
+    REPRESENTATION_CACHE["TTL"] = min(REPRESENTATION_CACHE["TTL"], 5)
+CONCURRENCY_LIMITS = {
+    # Per-process admission control; limits start at INITIAL and move
+    # between MIN and MAX depending on latency against TARGET_LATENCY.
+    "ENABLED": os.environ.get("CONCURRENCY_LIMITS", "1").lower()
+    in ("1", "true", "yes"),
+    "CLASSES": {
+        "read": {
+            "INITIAL": 32,
+            "MIN": 4,
+            "MAX": 128,
+            "TARGET_LATENCY": 0.1,
+            "QUEUE_TIMEOUT": 0.05,
+        },
+        "write": {
+            "INITIAL": 16,
+            "MIN": 2,
+            "MAX": 64,
+            "TARGET_LATENCY": 0.25,
+            "QUEUE_TIMEOUT": 0.1,
+        },
+        # Password hashing is CPU-bound: keep few in flight, queue longer.
+        "auth": {
+            "INITIAL": 4,
+            "MIN": 1,
+            "MAX": 16,
+            "TARGET_LATENCY": 0.5,
+            "QUEUE_TIMEOUT": 0.25,
+        },
+    },
+    # URL names; unlisted routes are "read" for safe methods, else "write".
+    "ROUTES": {
+        "login": "auth",
+        "register": "auth",
+        "register-bulk": "auth",
+        "metrics": None,
+    },
+}
+TASKS = {
+    # Consumed by ``manage.py run_tasks``; retries back off exponentially
+    # from RETRY_BACKOFF seconds and expired leases are picked up again.
+    "BATCH_SIZE": int(os.environ.get("TASKS_BATCH_SIZE", 100)),
+    "MAX_ATTEMPTS": int(os.environ.get("TASKS_MAX_ATTEMPTS", 5)),
+    "RETRY_BACKOFF": 10,
+    "LEASE": 300,
+    "POLL_INTERVAL": float(os.environ.get("TASKS_POLL_INTERVAL", 1)),
 }
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "noreply@example.com")
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
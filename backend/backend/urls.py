@@ -1,7 +1,14 @@
-from django.contrib import admin
+from django.apps import apps
+from django.conf import settings
 from django.urls import path, include
+from users.metrics import metrics_view
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
-    path("", include("users.urls")),
+    path("metrics", metrics_view, name="metrics"),
+    path("", include("users.async_urls" if settings.ASYNC_VIEWS else "users.urls")),
 ]
+
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
@@ -5,8 +5,11 @@ set -o errexit
 # Modify this line as needed for your package manager (pip, poetry, etc.)
 pip install -r requirements.txt
 
-# Convert static asset files
-python manage.py collectstatic --no-input
+# Convert static asset files (API_ONLY drops staticfiles, and has none to collect)
+case "${API_ONLY,,}" in
+    1|true|yes) echo "API_ONLY is set; skipping collectstatic" ;;
+    *) python manage.py collectstatic --no-input ;;
+esac
 
 # Apply any outstanding database migrations
 python manage.py migrate
\ No newline at end of file
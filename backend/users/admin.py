@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.contrib import admin
 from .models import User, Organisation
 
 # Register your models here.
 admin.site.register(User)
-admin.site.register(Organisation)
+# The changelist queries every organisation at once, which the shard router
+# refuses; sharded deployments manage organisations through the API instead.
+if not settings.DATABASE_SHARDS:
+    admin.site.register(Organisation)
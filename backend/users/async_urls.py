@@ -0,0 +1,31 @@
+from asgiref.sync import sync_to_async
+from .views import OrganisationListCreateView
+from .async_views import (
+    AsyncUserLoginView,
+    AsyncUserDetailView,
+    AsyncOrganisationListView,
+    AsyncOrganisationDetailView,
+    AsyncAddUserToOrganisationView,
+)
+from .urls import build_urlpatterns
+
+organisation_list = AsyncOrganisationListView.as_view()
+organisation_create = sync_to_async(OrganisationListCreateView.as_view())
+
+
+async def organisation_list_create(request, *args, **kwargs):
+    # Reads take the async path; creation stays on the DRF view.
+    if request.method == "GET":
+        return await organisation_list(request, *args, **kwargs)
+    return await organisation_create(request, *args, **kwargs)
+
+
+urlpatterns = build_urlpatterns(
+    {
+        "login": AsyncUserLoginView.as_view(),
+        "user-detail": AsyncUserDetailView.as_view(),
+        "organisation-list-create": organisation_list_create,
+        "organisation-detail": AsyncOrganisationDetailView.as_view(),
+        "add-user-to-organisation": AsyncAddUserToOrganisationView.as_view(),
+    }
+)
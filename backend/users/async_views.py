@@ -0,0 +1,317 @@
+import json
+import binascii
+import math
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.utils.urls import replace_query_param
+
+from backend.db.routers import shard_for
+
+from .authentication import CachedJWTAuthentication
+from .expansions import (
+    attach_members,
+    members_data,
+    members_window,
+    requested_expansions,
+)
+from .membership import add_member, get_membership_index
+from .models import User, Organisation
+from .pagination import (
+    OrganisationCursorPagination,
+    decode_position,
+    encode_position,
+    organisation_page,
+    position_of,
+)
+from .representations import get_user_entry, user_representation
+from .serializers import (
+    LoginSerializer,
+    OrganisationSerializer,
+    UserSerializer,
+    requested_fields,
+    sparse,
+)
+from .throttling import LoginThrottle, check_login, record_login_failure
+from .views import etag_matches, get_member_organisation, get_organisation_detail
+
+
+def client_error(errors):
+    return JsonResponse(
+        {
+            "status": "Bad Request",
+            "message": "Client error",
+            "statusCode": 400,
+            "errors": errors,
+        },
+        status=400,
+    )
+
+
+def parse_json(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class AsyncAPIView(View):
+    """Async counterpart of DRF's APIView for the hot JSON endpoints.
+
+    Requests are authenticated with ``CachedJWTAuthentication`` and the
+    database is only touched through the async ORM.
+    """
+
+    authentication = CachedJWTAuthentication()
+    requires_authentication = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.requires_authentication:
+            try:
+                result = await self.authentication.aauthenticate(request)
+            except APIException as exc:
+                return self.unauthorized(exc.detail)
+            if result is None:
+                return self.unauthorized(
+                    "Authentication credentials were not provided."
+                )
+            request.user, request.auth = result
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            return JsonResponse({"detail": exc.detail}, status=exc.status_code)
+
+    def unauthorized(self, detail):
+        response = JsonResponse({"detail": detail}, status=401)
+        response["WWW-Authenticate"] = self.authentication.authenticate_header(None)
+        return response
+
+
+class AsyncUserLoginView(AsyncAPIView):
+    requires_authentication = False
+
+    async def post(self, request, *args, **kwargs):
+        data = parse_json(request) or {}
+        wait = await sync_to_async(check_login)(
+            data.get("email"), LoginThrottle().get_ident(request)
+        )
+        if wait:
+            response = JsonResponse(
+                {
+                    "detail": "Request was throttled. Expected available in "
+                    f"{math.ceil(wait)} seconds."
+                },
+                status=429,
+            )
+            response["Retry-After"] = str(math.ceil(wait))
+            return response
+        login = await sync_to_async(self.login)(request, data)
+        if login is None:
+            return JsonResponse(
+                {
+                    "status": "Bad request",
+                    "message": "Authentication failed",
+                    "statusCode": 401,
+                },
+                status=401,
+            )
+        return JsonResponse(
+            {"status": "success", "message": "Login successful", "data": login},
+            status=200,
+        )
+
+    def login(self, request, data):
+        # Same serializer as UserLoginView, so field validation, backends and
+        # the auth signals all run; it is the one blocking step of the login.
+        serializer = LoginSerializer(data=data, context={"request": request})
+        if not serializer.is_valid():
+            record_login_failure(data.get("email"))
+            return None
+        user = serializer.validated_data["user"]
+        return {
+            "accessToken": serializer.get_tokens(user)["access"],
+            "user": user_representation(user),
+        }
+
+
+class AsyncUserDetailView(AsyncAPIView):
+    async def get(self, request, user_id, *args, **kwargs):
+        entry = await sync_to_async(get_user_entry)(user_id)
+        if entry is None:
+            return JsonResponse(
+                {"status": "error", "message": "User not found", "statusCode": 404},
+                status=404,
+            )
+        if not (
+            request.user.pk == entry["pk"]
+            or request.user.is_superuser
+            or request.user.is_staff
+            or await sync_to_async(get_membership_index().share_organisation)(
+                request.user.pk, entry["pk"]
+            )
+        ):
+            return JsonResponse(
+                {"detail": "You do not have permission to access this user's record."},
+                status=403,
+            )
+        return JsonResponse(
+            {
+                "status": "success",
+                "message": "User record retrieved successfully",
+                "data": sparse(
+                    entry["data"],
+                    requested_fields(request, UserSerializer.Meta.fields),
+                ),
+            },
+            status=200,
+        )
+
+
+class AsyncOrganisationListView(AsyncAPIView):
+    pagination = OrganisationCursorPagination
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            position = decode_position(
+                request.GET.get(self.pagination.cursor_query_param, "")
+            )
+            limit = min(
+                max(int(request.GET.get("limit", self.pagination.page_size)), 1),
+                self.pagination.max_page_size,
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return JsonResponse({"detail": "Invalid cursor"}, status=404)
+        expand_members = "members" in requested_expansions(request)
+        if expand_members:
+            members_limit, members_offset = members_window(request)
+
+        organisations = await sync_to_async(organisation_page)(
+            Organisation.objects.filter(users=request.user.pk), position, limit + 1
+        )
+
+        next_link = None
+        if len(organisations) > limit:
+            organisations = organisations[:limit]
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                self.pagination.cursor_query_param,
+                encode_position(position_of(organisations[-1])),
+            )
+        data = OrganisationSerializer(
+            organisations, many=True, context={"request": request}
+        ).data
+        if expand_members:
+            await sync_to_async(attach_members)(
+                organisations, members_limit, members_offset
+            )
+            data = [
+                {**item, **members_data(organisation)}
+                for item, organisation in zip(data, organisations)
+            ]
+        return JsonResponse(
+            {
+                "status": "success",
+                "message": "Organisations retrieved successfully",
+                "data": {"organisations": data, "next": next_link},
+            },
+            status=200,
+        )
+
+
+class AsyncOrganisationDetailView(AsyncAPIView):
+    async def get(self, request, orgId, *args, **kwargs):
+        try:
+            if "members" in requested_expansions(request):
+                return await self.get_expanded(request, orgId)
+            entry, is_member = await sync_to_async(get_organisation_detail)(
+                orgId, request.user
+            )
+        except Http404:
+            return JsonResponse(
+                {"detail": "No Organisation matches the given query."}, status=404
+            )
+        if not is_member:
+            return self.forbidden()
+        etag = entry["etag"]
+        if etag_matches(request, etag):
+            response = HttpResponse(status=304)
+        else:
+            response = JsonResponse(
+                {
+                    "status": "success",
+                    "message": "Organisation retrieved successfully",
+                    "data": sparse(
+                        entry["data"],
+                        requested_fields(request, OrganisationSerializer.Meta.fields),
+                    ),
+                },
+                status=200,
+            )
+        response["ETag"] = etag
+        return response
+
+    async def get_expanded(self, request, org_id):
+        # Member pages change without touching updated_at, so no ETag here.
+        members_limit, members_offset = members_window(request)
+        organisation = await sync_to_async(get_member_organisation)(
+            org_id, request.user
+        )
+        if not organisation.is_member:
+            return self.forbidden()
+        await sync_to_async(attach_members)(
+            [organisation], members_limit, members_offset
+        )
+        data = OrganisationSerializer(organisation, context={"request": request}).data
+        return JsonResponse(
+            {
+                "status": "success",
+                "message": "Organisation retrieved successfully",
+                "data": {**data, **members_data(organisation)},
+            },
+            status=200,
+        )
+
+    def forbidden(self):
+        return JsonResponse(
+            {
+                "detail": "You do not have permission to access this organization's data."
+            },
+            status=403,
+        )
+
+
+class AsyncAddUserToOrganisationView(AsyncAPIView):
+    async def post(self, request, orgId, *args, **kwargs):
+        data = parse_json(request)
+        if data is None or not data.get("userId"):
+            return client_error({"userId": ["This field is required."]})
+        try:
+            user = await User.objects.aget(userId=data["userId"])
+        except (User.DoesNotExist, ValidationError):
+            return client_error({"userId": ["User does not exist."]})
+        try:
+            organisation = await Organisation.objects.using(shard_for(orgId)).aget(
+                orgId=orgId
+            )
+        except (Organisation.DoesNotExist, ValidationError):
+            return JsonResponse(
+                {"detail": "No Organisation matches the given query."}, status=404
+            )
+
+        await sync_to_async(add_member)(organisation, user)
+        return JsonResponse(
+            {
+                "status": "success",
+                "message": "User added to organisation successfully",
+            },
+            status=200,
+        )
@@ -0,0 +1,168 @@
+import copy
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from backend.db.routers import pin_if_sticky
+
+from .cache import TTLCache
+from .metrics import timed
+from .revocation import get_revocation_list
+
+
+class UserCache:
+    """Process-local TTL/LRU of users, optionally backed by a shared Django cache.
+
+    With a shared cache, local copies live at most ``local_ttl`` seconds, since
+    only the shared entry is evicted when another worker saves the user.
+    """
+
+    key_prefix = "users:auth:"
+
+    def __init__(self, max_size, ttl, cache_alias=None, local_ttl=None):
+        self.ttl = ttl
+        self.shared = caches[cache_alias] if cache_alias else None
+        if self.shared is not None and local_ttl is not None:
+            ttl = min(ttl, local_ttl)
+        self.local = TTLCache(max_size, ttl)
+
+    def get(self, user_id):
+        user = self.local.get(user_id)
+        if user is None and self.shared is not None:
+            user = self.shared.get(f"{self.key_prefix}{user_id}")
+            if user is not None:
+                self.local.set(user_id, user)
+        # Hand out copies so per-request mutations never leak between requests.
+        return copy.copy(user) if user is not None else None
+
+    def set(self, user_id, user):
+        user = copy.copy(user)
+        self.local.set(user_id, user)
+        if self.shared is not None:
+            self.shared.set(f"{self.key_prefix}{user_id}", user, self.ttl)
+
+    def delete(self, user_id):
+        self.local.delete(user_id)
+        if self.shared is not None:
+            self.shared.delete(f"{self.key_prefix}{user_id}")
+
+    def clear(self):
+        self.local.clear()
+
+
+_user_cache = None
+
+
+def get_user_cache():
+    global _user_cache
+    if _user_cache is None:
+        config = getattr(settings, "USER_AUTH_CACHE", {})
+        _user_cache = UserCache(
+            max_size=config.get("MAX_SIZE", 10000),
+            ttl=config.get("TTL", 60),
+            cache_alias=config.get("CACHE_ALIAS"),
+            local_ttl=config.get("LOCAL_TTL"),
+        )
+    return _user_cache
+
+
+def revoked_token_error():
+    return InvalidToken(_("Token has been revoked"), code="token_revoked")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        with timed("auth"):
+            return super().authenticate(request)
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti is not None and get_revocation_list().is_revoked(jti):
+            raise revoked_token_error()
+        return validated_token
+
+    async def aget_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti is not None:
+            revocations = get_revocation_list()
+            if revocations.is_stale():
+                await sync_to_async(revocations.refresh)()
+            if revocations.might_be_revoked(jti) and await sync_to_async(
+                revocations.confirm
+            )(jti):
+                raise revoked_token_error()
+        return validated_token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        pin_if_sticky(user_id)
+        cache = get_user_cache()
+        user = cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(user_id, user)
+            return user
+
+        self.check_user(user, validated_token)
+        return user
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        pin_if_sticky(user_id)
+        cache = get_user_cache()
+        user = cache.get(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(user_id, user)
+
+        self.check_user(user, validated_token)
+        return user
+
+    def check_user(self, user, validated_token):
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+    async def aauthenticate(self, request):
+        with timed("auth"):
+            return await self._aauthenticate(request)
+
+    async def _aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = await self.aget_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
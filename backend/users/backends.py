@@ -0,0 +1,28 @@
+from django.contrib.auth.backends import ModelBackend
+
+from . import hashing
+from .models import User
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend that verifies passwords on the hashing executor."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash anyway so unknown emails cost the same as wrong passwords.
+            hashing.make_password(password)
+            return None
+        if not hashing.check_password(password, user.password):
+            return None
+        if hashing.must_update(user.password):
+            user.password = hashing.make_password(password)
+            user.save(update_fields=["password"])
+        if self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,256 @@
+import json
+import math
+import random
+import time
+import uuid
+from array import array
+from contextlib import ExitStack
+from operator import attrgetter
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.db.routers import each_shard, scatter, shard_aliases, shard_of
+
+from .membership import Membership, get_membership_index, member_ids
+from .models import User, Organisation, Task
+
+BENCH_EMAIL = "bench-user-{}@example.com"
+BENCH_PASSWORD = "bench-password-123"
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_dataset(
+    users, organisations, max_members=1000, skew=1.2, seed=0, batch_size=5000, log=None
+):
+    """Bulk-insert users, organisations and Pareto-skewed memberships.
+
+    Every user shares one pre-computed password hash, so seeding does not pay
+    the hasher per row and login benchmarks can use ``BENCH_PASSWORD``.
+    """
+    rng = random.Random(seed)
+    password = make_password(BENCH_PASSWORD)
+    offset = User.objects.filter(email__startswith="bench-user-").count()
+
+    user_pks = array("q")
+    rows = (
+        User(
+            email=BENCH_EMAIL.format(offset + i),
+            firstName=f"First{offset + i}",
+            lastName=f"Last{offset + i}",
+            password=password,
+        )
+        for i in range(users)
+    )
+    for batch in _batches(rows, batch_size):
+        user_pks.extend(u.pk for u in User.objects.bulk_create(batch))
+        if log:
+            log(f"users: {len(user_pks)}/{users}")
+
+    memberships = 0
+    rows = (
+        Organisation(name=f"Bench Organisation {i}", description="")
+        for i in range(organisations)
+    )
+    for batch in _batches(rows, batch_size):
+        links = {}
+        for organisation in Organisation.objects.bulk_create(batch):
+            size = min(max_members, len(user_pks), int(rng.paretovariate(skew)))
+            # Memberships go to the shard the organisation landed on.
+            shard = links.setdefault(shard_of(organisation), [])
+            for index in rng.sample(range(len(user_pks)), size):
+                shard.append(
+                    Membership(organisation_id=organisation.pk, user_id=user_pks[index])
+                )
+        for alias, shard in links.items():
+            Membership.objects.using(alias).bulk_create(
+                shard, batch_size=batch_size, ignore_conflicts=True
+            )
+            memberships += len(shard)
+        if log:
+            log(f"organisations: +{len(batch)}, memberships: {memberships}")
+    return {"users": users, "organisations": organisations, "memberships": memberships}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def measure(name, request, iterations):
+    latencies = []
+    queries = []
+    statuses = set()
+    started = time.perf_counter()
+    aliases = ["default", *shard_aliases()]
+    for i in range(iterations):
+        with ExitStack() as stack:
+            captured = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in aliases
+            ]
+            begin = time.perf_counter()
+            response = request(i)
+            latencies.append((time.perf_counter() - begin) * 1000)
+        queries.append(sum(len(ctx.captured_queries) for ctx in captured))
+        statuses.add(response.status_code)
+    elapsed = time.perf_counter() - started
+    return {
+        "endpoint": name,
+        "requests": iterations,
+        "throughput_rps": iterations / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "queries_per_request": sum(queries) / len(queries) if queries else 0.0,
+        "max_queries": max(queries, default=0),
+        "statuses": sorted(statuses),
+    }
+
+
+def pick_fixtures():
+    candidates = scatter(
+        Organisation.objects.annotate(members=Count("users"))
+        .filter(members__gte=2)
+        .order_by("id"),
+        key=attrgetter("pk"),
+        limit=1,
+    )
+    if not candidates:
+        raise ValueError("Dataset needs an organisation with at least two members")
+    organisation = candidates[0]
+    pks = list(member_ids(organisation).order_by("user_id")[:2])
+    actor, other = User.objects.filter(pk__in=pks).order_by("id")
+    return actor, other, organisation
+
+
+def run_endpoints(iterations=200, endpoints=None):
+    actor, other, organisation = pick_fixtures()
+    client = Client()
+    auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(actor)}"}
+    run_id = uuid.uuid4().hex[:8]
+    password = BENCH_PASSWORD if actor.check_password(BENCH_PASSWORD) else None
+
+    cases = {
+        "auth/register": lambda i: client.post(
+            reverse("register"),
+            {
+                "firstName": "Bench",
+                "lastName": "Register",
+                "email": f"bench-register-{run_id}-{i}@example.com",
+                "password": BENCH_PASSWORD,
+            },
+            content_type="application/json",
+        ),
+        "api/users/<uuid>": lambda i: client.get(
+            reverse("user-detail", args=[other.userId]), **auth
+        ),
+        "api/organisations": lambda i: client.get(
+            reverse("organisation-list-create"), **auth
+        ),
+        "api/organisations/<uuid>": lambda i: client.get(
+            reverse("organisation-detail", args=[organisation.orgId]), **auth
+        ),
+    }
+    if password:
+        cases["auth/login"] = lambda i: client.post(
+            reverse("login"),
+            {"email": actor.email, "password": password},
+            content_type="application/json",
+        )
+
+    results = []
+    # Repeated logins from one client would otherwise measure the throttle.
+    throttle = {**getattr(settings, "LOGIN_THROTTLE", {}), "ENABLED": False}
+    try:
+        with override_settings(LOGIN_THROTTLE=throttle):
+            for name, request in cases.items():
+                if endpoints and name not in endpoints:
+                    continue
+                results.append(measure(name, request, iterations))
+    finally:
+        remove_registrations(run_id)
+    return results
+
+
+def remove_registrations(run_id):
+    """Delete what ``auth/register`` created in run ``run_id``.
+
+    Requests commit like they do in production, so the users, their default
+    organisations and memberships, and the tasks they queued are removed
+    afterwards rather than rolled back.
+    """
+    registered = User.objects.filter(email__startswith=f"bench-register-{run_id}-")
+    user_pks = list(registered.values_list("pk", flat=True))
+    if not user_pks:
+        return 0
+    org_ids = []
+    for memberships in each_shard(Membership.objects.filter(user_id__in=user_pks)):
+        organisations = Organisation.objects.using(memberships.db).filter(
+            pk__in=list(memberships.values_list("organisation_id", flat=True))
+        )
+        org_ids.extend(
+            str(org_id) for org_id in organisations.values_list("orgId", flat=True)
+        )
+        organisations.delete()
+    Task.objects.filter(
+        name="users.send_welcome_email", payload__user__in=user_pks
+    ).delete()
+    Task.objects.filter(
+        name="users.warm_representations", payload__organisation__in=org_ids
+    ).delete()
+    registered.delete()
+    get_membership_index().invalidate(user_pks)
+    return len(user_pks)
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Return human-readable regressions of ``results`` against ``baseline``."""
+    previous = {row["endpoint"]: row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get(row["endpoint"])
+        if old is None:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if old[key] and row[key] > old[key] * (1 + tolerance):
+                regressions.append(
+                    f"{row['endpoint']}: {key} {old[key]:.2f} -> {row[key]:.2f}"
+                )
+        if old["throughput_rps"] and row["throughput_rps"] < old["throughput_rps"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{row['endpoint']}: throughput_rps "
+                f"{old['throughput_rps']:.1f} -> {row['throughput_rps']:.1f}"
+            )
+        if row["max_queries"] > old["max_queries"]:
+            regressions.append(
+                f"{row['endpoint']}: max_queries "
+                f"{old['max_queries']} -> {row['max_queries']}"
+            )
+    return regressions
+
+
+def load_results(path):
+    with open(path) as fh:
+        return json.load(fh)["results"]
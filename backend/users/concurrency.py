@@ -0,0 +1,216 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class AdaptiveLimiter:
+    """Concurrency limit for one class of routes, adapted AIMD-style.
+
+    A request finishing under ``target`` latency while the limit is at least
+    half used raises the limit by ``1 / limit`` (about +1 per limit's worth of
+    requests); one finishing over target or with a 5xx multiplies it by
+    ``backoff``, at most once per ``target`` interval so a single slow burst
+    does not collapse it. Requests over the limit wait up to
+    ``queue_timeout`` for a slot and are shed otherwise; ``aacquire`` waits
+    on the event loop instead of blocking a thread.
+    """
+
+    def __init__(
+        self, name, initial, min_limit, max_limit, target, queue_timeout, backoff=0.9
+    ):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target = target
+        self.queue_timeout = queue_timeout
+        self.backoff = backoff
+        self.in_flight = 0
+        self.shed = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = deque()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.queue_timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.shed += 1
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + self.queue_timeout
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.shed += 1
+                    return False
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._cond:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, latency, failed=False):
+        now = time.monotonic()
+        with self._cond:
+            busy = self.in_flight * 2 >= self.limit
+            self.in_flight -= 1
+            if failed or latency > self.target:
+                if now - self._last_decrease >= self.target:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            elif busy:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify()
+            while self._async_waiters:
+                loop, waiter = self._async_waiters.popleft()
+                if not waiter.done():
+                    loop.call_soon_threadsafe(_wake, waiter)
+                    break
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_limiters = None
+
+
+def get_limiters():
+    global _limiters
+    if _limiters is None:
+        classes = getattr(settings, "CONCURRENCY_LIMITS", {}).get("CLASSES", {})
+        _limiters = {
+            name: AdaptiveLimiter(
+                name,
+                initial=config["INITIAL"],
+                min_limit=config["MIN"],
+                max_limit=config["MAX"],
+                target=config["TARGET_LATENCY"],
+                queue_timeout=config["QUEUE_TIMEOUT"],
+            )
+            for name, config in classes.items()
+        }
+    return _limiters
+
+
+def reset_limiters():
+    global _limiters
+    _limiters = None
+
+
+def route_class(url_name, method):
+    """Limiter class for a route: the ``ROUTES`` entry, else read/write by method.
+
+    A ``ROUTES`` entry of None exempts the route.
+    """
+    routes = getattr(settings, "CONCURRENCY_LIMITS", {}).get("ROUTES", {})
+    if url_name in routes:
+        return routes[url_name]
+    return "read" if method in SAFE_METHODS else "write"
+
+
+def overloaded():
+    response = JsonResponse(
+        {
+            "status": "Service Unavailable",
+            "message": "Server is busy, retry shortly",
+            "statusCode": 503,
+        },
+        status=503,
+    )
+    response["Retry-After"] = "1"
+    return response
+
+
+class ConcurrencyLimitMiddleware:
+    """Admit requests per route class so login bursts cannot starve reads.
+
+    Limits are per process. Under WSGI a queued request blocks its worker
+    thread; under ASGI it waits on the event loop. A streaming response holds
+    its slot until the stream is closed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "CONCURRENCY_LIMITS", {}).get("ENABLED")
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Django would run a sync process_view in its shared sync thread.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.finish(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.finish(request, await self.get_response(request))
+
+    def finish(self, request, response):
+        admitted = getattr(request, "_concurrency_admitted", None)
+        if admitted is None:
+            return response
+        limiter, start = admitted
+        latency = time.perf_counter() - start
+        failed = response.status_code >= 500
+        if response.streaming:
+            # Latency is time to first byte; the slot is held until close().
+            response._resource_closers.append(
+                lambda: limiter.release(latency, failed=failed)
+            )
+        else:
+            limiter.release(latency, failed=failed)
+        return response
+
+    def limiter_for(self, request):
+        if not self.enabled:
+            return None
+        name = route_class(request.resolver_match.url_name, request.method)
+        return get_limiters().get(name)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        limiter = self.limiter_for(request)
+        if limiter is None:
+            return None
+        if not limiter.acquire():
+            return overloaded()
+        request._concurrency_admitted = (limiter, time.perf_counter())
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        limiter = self.limiter_for(request)
+        if limiter is None:
+            return None
+        if not await limiter.aacquire():
+            return overloaded()
+        request._concurrency_admitted = (limiter, time.perf_counter())
+        return None
@@ -0,0 +1,45 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+
+EXPORT_FIELDS = ["userId", "firstName", "lastName", "email", "phone"]
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iter_user_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    rows = queryset.order_by("id").values_list(*EXPORT_FIELDS)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield [str(row[0]), *row[1:]]
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n"
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(["" if value is None else value for value in row])
+
+
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_lines, "application/x-ndjson", "users.ndjson"),
+    "csv": (csv_lines, "text/csv", "users.csv"),
+}
+
+
+def stream_users(queryset, output):
+    lines, content_type, filename = EXPORT_FORMATS[output]
+    response = StreamingHttpResponse(
+        lines(iter_user_rows(queryset)), content_type=content_type
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
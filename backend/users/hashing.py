@@ -0,0 +1,160 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.exceptions import APIException
+
+
+class HashingUnavailable(APIException):
+    status_code = 503
+    default_detail = "Password hashing is temporarily overloaded, try again shortly."
+    default_code = "hashing_unavailable"
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+class HashingExecutor:
+    """Bounded process pool that runs password hashers off the request thread.
+
+    With ``workers=0`` hashing runs inline, which keeps the same call surface
+    for environments where spawning processes is undesirable.
+    """
+
+    def __init__(self, workers, max_pending, timeout):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(settings.SETTINGS_MODULE,),
+                )
+                self._pid = os.getpid()
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def submit(self, fn, *args):
+        if not self.workers:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        if self.max_pending < 1 or not self._slots.acquire(blocking=False):
+            raise HashingUnavailable()
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_pool()
+            raise HashingUnavailable()
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise HashingUnavailable()
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise HashingUnavailable()
+
+    def run(self, fn, *args):
+        return self.result(self.submit(fn, *args))
+
+    def map(self, fn, items):
+        """Run ``fn`` over ``items`` with at most ``max_pending`` calls in flight."""
+        window = max(self.max_pending, 1)
+        results = []
+        for start in range(0, len(items), window):
+            futures = [self.submit(fn, item) for item in items[start : start + window]]
+            results.extend(self.result(future) for future in futures)
+        return results
+
+    async def arun(self, fn, *args):
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise HashingUnavailable()
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise HashingUnavailable()
+
+    def shutdown(self):
+        self._reset_pool()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = getattr(settings, "PASSWORD_HASHING", {})
+            _executor = HashingExecutor(
+                workers=config.get("WORKERS", 0),
+                max_pending=config.get("MAX_PENDING", 64),
+                timeout=config.get("TIMEOUT", 5),
+            )
+        return _executor
+
+
+def make_password(password):
+    return get_executor().run(hashers.make_password, password)
+
+
+def make_passwords(passwords):
+    return get_executor().map(hashers.make_password, list(passwords))
+
+
+def check_password(password, encoded):
+    return get_executor().run(hashers.check_password, password, encoded)
+
+
+async def amake_password(password):
+    return await get_executor().arun(hashers.make_password, password)
+
+
+async def acheck_password(password, encoded):
+    return await get_executor().arun(hashers.check_password, password, encoded)
+
+
+def must_update(encoded):
+    try:
+        return hashers.identify_hasher(encoded).must_update(encoded)
+    except ValueError:
+        return False
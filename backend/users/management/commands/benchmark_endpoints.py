@@ -0,0 +1,55 @@
+import json
+import platform
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from users.benchmarks import compare, load_results, run_endpoints
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure throughput, p50/p95/p99 latency and SQL queries per endpoint, "
+        "optionally failing on regressions against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--endpoint", action="append", dest="endpoints")
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+        parser.add_argument("--baseline", help="JSON results to compare against.")
+        parser.add_argument("--tolerance", type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        # Requests commit normally so commit cost and on_commit work are
+        # measured; run_endpoints deletes the rows it registered afterwards.
+        try:
+            results = run_endpoints(options["requests"], options["endpoints"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for row in results:
+            self.stdout.write(
+                "{endpoint:<26} {throughput_rps:>9.1f} req/s  p50 {p50_ms:>7.2f}ms  "
+                "p95 {p95_ms:>7.2f}ms  p99 {p99_ms:>7.2f}ms  "
+                "queries {queries_per_request:.1f}".format(**row)
+            )
+
+        if options["output"]:
+            document = {
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "results": results,
+            }
+            with open(options["output"], "w") as fh:
+                json.dump(document, fh, indent=2)
+
+        if options["baseline"]:
+            regressions = compare(
+                results, load_results(options["baseline"]), options["tolerance"]
+            )
+            if regressions:
+                raise CommandError(
+                    "Performance regressions:\n" + "\n".join(regressions)
+                )
+            self.stdout.write("No regressions against baseline.")
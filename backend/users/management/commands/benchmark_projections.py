@@ -0,0 +1,94 @@
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.db.routers import scatter, shard_aliases
+from users.models import User, Organisation
+from users.projections import ORGANISATION_PROJECTION, USER_PROJECTION
+from users.serializers import UserSerializer, OrganisationSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/second of ModelSerializer lists against the values() "
+        "projections used by the list endpoints."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000)
+        parser.add_argument(
+            "--existing",
+            action="store_true",
+            help="Benchmark the rows already in the database instead of seeding.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with ExitStack() as stack:
+                # Seeded organisations land on the shards; roll those back too.
+                for alias in ["default", *shard_aliases()]:
+                    stack.enter_context(transaction.atomic(using=alias))
+                if not options["existing"]:
+                    self.seed(options["rows"])
+                self.run()
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, rows):
+        User.objects.bulk_create(
+            (
+                User(
+                    email=f"bench-{uuid.uuid4().hex}@example.com",
+                    firstName="Bench",
+                    lastName=str(i),
+                    password="!",
+                )
+                for i in range(rows)
+            ),
+            batch_size=5000,
+        )
+        Organisation.objects.bulk_create(
+            (Organisation(name=f"Bench {i}") for i in range(rows)), batch_size=5000
+        )
+
+    def measure(self, label, fn):
+        start = time.perf_counter()
+        count = len(fn())
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else float("inf")
+        self.stdout.write(f"{label:<34} {count:>9} rows {rate:>14,.0f} rows/s")
+        return rate
+
+    def run(self):
+        pairs = [
+            (
+                "users",
+                lambda: UserSerializer(User.objects.all(), many=True).data,
+                lambda: USER_PROJECTION.render(
+                    USER_PROJECTION.queryset(User.objects.all())
+                ),
+            ),
+            (
+                "organisations",
+                lambda: OrganisationSerializer(
+                    scatter(Organisation.objects.all()), many=True
+                ).data,
+                lambda: ORGANISATION_PROJECTION.render(
+                    scatter(
+                        ORGANISATION_PROJECTION.queryset(Organisation.objects.all())
+                    )
+                ),
+            ),
+        ]
+        for name, before, after in pairs:
+            model_rate = self.measure(f"{name} (model serializer)", before)
+            projection_rate = self.measure(f"{name} (projection)", after)
+            self.stdout.write(f"{name} speedup: {projection_rate / model_rate:.2f}x")
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from users.benchmarks import generate_dataset
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate benchmark users, organisations and skewed memberships."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000000)
+        parser.add_argument("--organisations", type=int, default=100000)
+        parser.add_argument("--max-members", type=int, default=1000)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.2,
+            help="Pareto shape for membership sizes; lower means heavier tail.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        log = self.stdout.write if options["verbosity"] > 1 else None
+        summary = generate_dataset(
+            users=options["users"],
+            organisations=options["organisations"],
+            max_members=options["max_members"],
+            skew=options["skew"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=log,
+        )
+        self.stdout.write(
+            "Created {users} users, {organisations} organisations and "
+            "{memberships} memberships".format(**summary)
+        )
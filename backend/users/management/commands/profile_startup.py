@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+# Runs in a fresh interpreter: times each AppConfig's import, models and
+# ready() phases, then loads the URLconf the way the first request would.
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import django
+from django.apps import config
+
+phases = {}
+create = config.AppConfig.create.__func__
+
+def timed(entry, phase, fn):
+    def wrapper(*args, **kwargs):
+        begin = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            phases.setdefault(entry, {})[phase] = time.perf_counter() - begin
+    return wrapper
+
+def create_timed(cls, entry):
+    app_config = timed(entry, "import", create)(cls, entry)
+    app_config.import_models = timed(entry, "models", app_config.import_models)
+    app_config.ready = timed(entry, "ready", app_config.ready)
+    return app_config
+
+config.AppConfig.create = classmethod(create_timed)
+setup_start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+setup = time.perf_counter() - setup_start
+urls_start = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls = time.perf_counter() - urls_start
+json.dump(
+    {
+        "apps": phases,
+        "setup": setup,
+        "urls": urls,
+        "total": time.perf_counter() - start,
+    },
+    sys.stdout,
+)
+"""
+
+
+def parse_import_times(stderr):
+    """Return ``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def group_by_package(modules):
+    packages = {}
+    for name, (own, _cumulative) in modules.items():
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + own
+    return packages
+
+
+def profile(api_only, env=None):
+    env = dict(os.environ if env is None else env)
+    env.setdefault("DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE)
+    env["API_ONLY"] = "1" if api_only else ""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT],
+        capture_output=True,
+        cwd=settings.BASE_DIR,
+        env=env,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if completed.returncode:
+        raise CommandError(completed.stderr.strip().splitlines()[-1])
+    result = json.loads(completed.stdout)
+    result["wall"] = wall
+    result["modules"] = parse_import_times(completed.stderr)
+    return result
+
+
+def ms(seconds):
+    return f"{seconds * 1000:8.1f}"
+
+
+class Command(BaseCommand):
+    help = "Profile worker cold start: per-module import time and per-app setup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--api-only",
+            action="store_true",
+            help="Profile with API_ONLY=1 (no admin, sessions, messages, static).",
+        )
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Profile the full and API-only configurations side by side.",
+        )
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Fresh interpreters per configuration; medians are reported.",
+        )
+
+    def handle(self, *args, **options):
+        modes = [False, True] if options["compare"] else [options["api_only"]]
+        summaries = {}
+        for api_only in modes:
+            runs = [profile(api_only) for _ in range(max(options["repeat"], 1))]
+            label = "api-only" if api_only else "full"
+            summaries[label] = {
+                key: statistics.median(run[key] for run in runs)
+                for key in ("wall", "total", "setup", "urls")
+            }
+            self.report(label, runs[-1], options["top"])
+
+        self.stdout.write("\nCold start (median, ms)")
+        self.stdout.write(f"{'mode':<10} {'process':>8} {'setup':>8} {'urls':>8}")
+        for label, summary in summaries.items():
+            self.stdout.write(
+                f"{label:<10} {ms(summary['wall'])} {ms(summary['setup'])} "
+                f"{ms(summary['urls'])}"
+            )
+
+    def report(self, label, run, top):
+        self.stdout.write(f"\n== {label} ==")
+        self.stdout.write(f"{'app':<40} {'import':>8} {'models':>8} {'ready':>8}  (ms)")
+        for app, phases in run["apps"].items():
+            self.stdout.write(
+                f"{app:<40} {ms(phases.get('import', 0))} "
+                f"{ms(phases.get('models', 0))} {ms(phases.get('ready', 0))}"
+            )
+
+        modules = run["modules"]
+        self.stdout.write(f"\nTop {top} modules by cumulative import time (ms)")
+        for name, (_own, cumulative) in sorted(
+            modules.items(), key=lambda item: item[1][1], reverse=True
+        )[:top]:
+            self.stdout.write(f"{name:<60} {cumulative / 1000:8.1f}")
+
+        self.stdout.write(f"\nTop {top} packages by own import time (ms)")
+        for package, own in sorted(
+            group_by_package(modules).items(), key=lambda item: item[1], reverse=True
+        )[:top]:
+            self.stdout.write(f"{package:<60} {own / 1000:8.1f}")
@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from backend.db.routers import group_by_shard, shard_aliases
+from users.membership import BULK_CHUNK_SIZE, Membership, get_membership_index
+from users.models import Organisation
+
+
+def misplaced(alias):
+    """``{target: [pk, ...]}`` for organisations on ``alias`` that hash elsewhere."""
+    rows = Organisation.objects.using(alias).values_list("pk", "orgId")
+    groups = group_by_shard(rows.iterator(), key=lambda row: row[1])
+    return {
+        target: [pk for pk, _org_id in group]
+        for target, group in groups.items()
+        if target != alias
+    }
+
+
+def move(source, target, pks):
+    """Copy organisations and their memberships to ``target``, then drop them.
+
+    Primary keys are kept, so the membership index stays valid; small ids from
+    ``default``'s sequence do not clash with the 63-bit hashes shards assign.
+    Copies ignore conflicts, so a run interrupted between the two steps can be
+    repeated.
+    """
+    organisations = list(Organisation.objects.using(source).filter(pk__in=pks))
+    memberships = list(
+        Membership.objects.using(source)
+        .filter(organisation_id__in=pks)
+        .values_list("organisation_id", "user_id")
+    )
+    with transaction.atomic(using=target):
+        Organisation.objects.using(target).bulk_create(
+            organisations, batch_size=BULK_CHUNK_SIZE, ignore_conflicts=True
+        )
+        Membership.objects.using(target).bulk_create(
+            [
+                Membership(organisation_id=org_id, user_id=user_id)
+                for org_id, user_id in memberships
+            ],
+            batch_size=BULK_CHUNK_SIZE,
+            ignore_conflicts=True,
+        )
+    with transaction.atomic(using=source):
+        Membership.objects.using(source).filter(organisation_id__in=pks).delete()
+        Organisation.objects.using(source).filter(pk__in=pks).delete()
+    # Deleting memberships sends no m2m_changed; ids are unchanged but an
+    # index loaded mid-move may have missed them.
+    get_membership_index().invalidate({user_id for _org_id, user_id in memberships})
+
+
+class Command(BaseCommand):
+    help = (
+        "Move organisations and their memberships to the shard their orgId "
+        "hashes to. Run after adding aliases to DATABASE_SHARD_URLS, including "
+        "the first time, to move organisations created on default; "
+        "organisations not on their shard are not found until moved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many organisations would move without moving them.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BULK_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        shards = shard_aliases()
+        if not shards:
+            raise CommandError("DATABASE_SHARDS is empty; nothing to rebalance.")
+        batch_size = max(options["batch_size"], 1)
+        total = 0
+        # default holds everything created before sharding was switched on.
+        for source in ["default", *shards]:
+            for target, pks in misplaced(source).items():
+                total += len(pks)
+                self.stdout.write(f"{source} -> {target}: {len(pks)} organisation(s)")
+                if options["dry_run"]:
+                    continue
+                for start in range(0, len(pks), batch_size):
+                    move(source, target, pks[start : start + batch_size])
+        verb = "Would move" if options["dry_run"] else "Moved"
+        self.stdout.write(f"{verb} {total} organisation(s)")
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.revocation import get_revocation_list, purge_expired
+
+
+class Command(BaseCommand):
+    help = "Revoke access tokens by jti and/or purge expired revocations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("jti", nargs="*")
+        parser.add_argument(
+            "--purge-expired",
+            action="store_true",
+            help="Delete revocations whose tokens have expired anyway.",
+        )
+
+    def handle(self, *args, **options):
+        # Without the token itself, assume the longest lifetime it could have.
+        expires_at = timezone.now() + max(
+            settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"],
+            settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"],
+        )
+        revocations = get_revocation_list()
+        for jti in options["jti"]:
+            revocations.revoke(jti, expires_at)
+        if options["jti"]:
+            self.stdout.write(f"Revoked {len(options['jti'])} token(s)")
+        if options["purge_expired"]:
+            self.stdout.write(f"Purged {purge_expired()} expired revocation(s)")
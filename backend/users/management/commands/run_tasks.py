@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import Task
+from users.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks (welcome emails, cache warming)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the tasks that are due now and exit.",
+        )
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Seconds to sleep when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        config = getattr(settings, "TASKS", {})
+        interval = options["interval"] or config.get("POLL_INTERVAL", 1)
+        completed = 0
+        try:
+            while True:
+                done = run_pending(batch_size=options["batch_size"])
+                completed += done
+                if done:
+                    continue
+                # Due rows may be leased to another worker or have just
+                # failed; wait rather than spin on them.
+                if options["once"] and not self.due():
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            f"Completed {completed} task(s); "
+            f"{Task.objects.filter(status=Task.FAILED).count()} failed"
+        )
+
+    def due(self):
+        return Task.objects.filter(
+            status=Task.QUEUED, run_at__lte=timezone.now()
+        ).exists()
@@ -0,0 +1,81 @@
+import re
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from users.membership import Membership
+from users.models import User, Organisation
+
+SQLITE_SCAN = re.compile(r"\bSCAN (\w+)\b(?! USING)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def hot_queries():
+    user_pk, org_pk = 1, 1
+    # Shards share the schema; explain against the connection being checked.
+    organisations = Organisation.objects.using(connection.alias)
+    memberships = Membership.objects.using(connection.alias)
+    created_at = timezone.now()
+    return {
+        "login (exact email)": User.objects.filter(email="someone@example.com"),
+        "user detail": User.objects.filter(userId=uuid.uuid4()),
+        "organisation detail + membership": organisations.annotate(
+            is_member=Exists(
+                Membership.objects.filter(organisation=OuterRef("pk"), user=user_pk)
+            )
+        ).filter(orgId=uuid.uuid4()),
+        "organisation list page": organisations.filter(users=user_pk)
+        .filter(
+            Q(created_at__gt=created_at)
+            | Q(created_at=created_at, orgId__gt=uuid.uuid4())
+        )
+        .order_by("created_at", "orgId")[:101],
+        "memberships by user": memberships.filter(
+            user_id__in=[user_pk, user_pk + 1]
+        ).values_list("user_id", "organisation_id"),
+        "members of organisation": memberships.filter(
+            organisation_id=org_pk, user_id__in=[user_pk]
+        ).values_list("user_id", flat=True),
+    }
+
+
+def sequential_scans(plan):
+    pattern = POSTGRES_SCAN if connection.vendor == "postgresql" else SQLITE_SCAN
+    return sorted(set(pattern.findall(plan)))
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN each hot query of the auth and membership paths and fail if "
+        "any of them falls back to a sequential scan."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            raise CommandError(f"Unsupported database vendor: {connection.vendor}")
+
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # Small tables make seq scans cheaper than any index; this asks
+                # whether an index *can* serve the query at all.
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            for name, queryset in hot_queries().items():
+                plan = queryset.explain()
+                scans = sequential_scans(plan)
+                status = "SEQ SCAN " + ", ".join(scans) if scans else "index"
+                self.stdout.write(f"{name:<36} {status}")
+                if options["verbosity"] > 1:
+                    self.stdout.write(plan)
+                if scans:
+                    failures.append(name)
+
+        if failures:
+            raise CommandError(
+                "Sequential scans in hot queries: " + ", ".join(failures)
+            )
+        self.stdout.write("All hot queries are index-backed.")
@@ -0,0 +1,204 @@
+import threading
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import transaction
+
+from backend.db.routers import shard_aliases, shard_of
+
+from .cache import TTLCache
+from .models import User, Organisation
+from .queue import enqueue
+
+Membership = Organisation.users.through
+
+BULK_CHUNK_SIZE = 1000
+
+
+class MembershipIndex:
+    """Per-user sets of organisation ids for in-memory co-membership checks.
+
+    Sets are loaded on first use and then patched by the ``m2m_changed``
+    receivers in ``users.signals``; the TTL bounds staleness for writes made by
+    other processes. Negative co-membership answers are never served from
+    memory (see ``share_organisation``).
+    """
+
+    def __init__(self, max_size, ttl):
+        self.cache = TTLCache(max_size, ttl)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _load(self, user_ids):
+        found = {user_id: set() for user_id in user_ids}
+        # Memberships live with their organisation, so read every shard.
+        for alias in shard_aliases() or [None]:
+            rows = (
+                Membership.objects.using(alias)
+                .filter(user_id__in=user_ids)
+                .values_list("user_id", "organisation_id")
+            )
+            for user_id, org_id in rows:
+                found[user_id].add(org_id)
+        for user_id, org_ids in found.items():
+            self.cache.set(user_id, frozenset(org_ids))
+        return found
+
+    def org_ids(self, user_id):
+        org_ids = self.cache.get(user_id)
+        self._count(org_ids is not None)
+        if org_ids is None:
+            org_ids = self._load([user_id])[user_id]
+        return org_ids
+
+    def share_organisation(self, user_id, other_id):
+        """Whether the two users share an organisation.
+
+        Only a shared organisation is answered from memory: another worker
+        may have added one since the sets were cached, so anything else is
+        re-read from the database.
+        """
+        sets = {user_id: self.cache.get(user_id), other_id: self.cache.get(other_id)}
+        hit = None not in sets.values() and not sets[user_id].isdisjoint(sets[other_id])
+        self._count(hit)
+        if hit:
+            return True
+        sets = self._load([user_id, other_id])
+        return not sets[user_id].isdisjoint(sets[other_id])
+
+    def add(self, user_ids, org_ids):
+        for user_id in user_ids:
+            current = self.cache.get(user_id)
+            if current is not None:
+                self.cache.set(user_id, current | frozenset(org_ids))
+
+    def remove(self, user_ids, org_ids):
+        for user_id in user_ids:
+            current = self.cache.get(user_id)
+            if current is not None:
+                self.cache.set(user_id, current - frozenset(org_ids))
+
+    def invalidate(self, user_ids):
+        for user_id in user_ids:
+            self.cache.delete(user_id)
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "size": len(self.cache),
+        }
+
+
+_membership_index = None
+
+
+def _chunks(values, size=BULK_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def member_ids(organisation):
+    """Member user ids, read from the database holding ``organisation``.
+
+    ``organisation.users`` would join users on that database, which a shard
+    does not have.
+    """
+    return (
+        Membership.objects.db_manager(hints={"instance": organisation})
+        .filter(organisation_id=organisation.pk)
+        .values_list("user_id", flat=True)
+    )
+
+
+def add_member(organisation, user):
+    """Add one user and queue their notification if they were not a member."""
+    db = shard_of(organisation)
+    with transaction.atomic(), transaction.atomic(using=db) if db else nullcontext():
+        if (
+            Membership.objects.using(db)
+            .filter(organisation_id=organisation.pk, user_id=user.pk)
+            .exists()
+        ):
+            return False
+        organisation.users.add(user)
+        enqueue(
+            "users.send_membership_email",
+            {"organisation": str(organisation.orgId), "users": [user.pk]},
+        )
+    return True
+
+
+def add_members(organisation, user_ids):
+    """Add users by ``userId`` in bulk and report an outcome per requested id."""
+    user_ids = list(dict.fromkeys(user_ids))
+    found = {}
+    for chunk in _chunks(user_ids):
+        found.update(User.objects.filter(userId__in=chunk).values_list("userId", "pk"))
+
+    existing = set()
+    pks = list(found.values())
+    db = shard_of(organisation)
+    memberships = Membership.objects.using(db)
+    for chunk in _chunks(pks):
+        existing.update(
+            memberships.filter(
+                organisation_id=organisation.pk, user_id__in=chunk
+            ).values_list("user_id", flat=True)
+        )
+
+    added = [pk for pk in pks if pk not in existing]
+    with transaction.atomic(), transaction.atomic(using=db) if db else nullcontext():
+        memberships.bulk_create(
+            [Membership(organisation_id=organisation.pk, user_id=pk) for pk in added],
+            batch_size=BULK_CHUNK_SIZE,
+            ignore_conflicts=True,
+        )
+        if added:
+            enqueue(
+                "users.send_membership_email",
+                {"organisation": str(organisation.orgId), "users": added},
+            )
+    # bulk_create bypasses m2m_changed, so patch the index directly.
+    get_membership_index().add(added, [organisation.pk])
+
+    results = {}
+    for user_id in user_ids:
+        pk = found.get(user_id)
+        if pk is None:
+            results[str(user_id)] = "not_found"
+        elif pk in existing:
+            results[str(user_id)] = "already_member"
+        else:
+            results[str(user_id)] = "added"
+    return results
+
+
+def get_membership_index():
+    global _membership_index
+    if _membership_index is None:
+        config = getattr(settings, "MEMBERSHIP_INDEX", {})
+        _membership_index = MembershipIndex(
+            max_size=config.get("MAX_SIZE", 100000),
+            ttl=config.get("TTL", 60),
+        )
+    return _membership_index
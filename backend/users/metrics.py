@@ -0,0 +1,277 @@
+import contextvars
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+from backend.db.pool import pool_stats
+
+from .concurrency import get_limiters
+from .membership import get_membership_index
+from .revocation import get_revocation_list
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db", "auth", "serialize")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.auth = 0.0
+        self.serialize = 0.0
+
+
+def record(phase, seconds):
+    """Add ``seconds`` to ``phase`` ("auth" or "serialize") of the current request."""
+    stats = _current.get()
+    if stats is not None:
+        setattr(stats, phase, getattr(stats, phase) + seconds)
+
+
+@contextmanager
+def timed(phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - start)
+
+
+def _count_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db += time.perf_counter() - start
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "queries", "db", "auth", "serialize")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db = 0.0
+        self.auth = 0.0
+        self.serialize = 0.0
+
+
+class Registry:
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, method, status, elapsed, stats):
+        key = (route, method, str(status))
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = RouteMetrics()
+            metrics.latency.observe(elapsed)
+            metrics.queries.observe(stats.queries)
+            metrics.db += stats.db
+            metrics.auth += stats.auth
+            metrics.serialize += stats.serialize
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: (
+                    (list(m.latency.counts), m.latency.sum, m.latency.count),
+                    (list(m.queries.counts), m.queries.sum, m.queries.count),
+                    m.db,
+                    m.auth,
+                    m.serialize,
+                )
+                for key, m in self._routes.items()
+            }
+
+
+registry = Registry()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _histogram_lines(name, labels, buckets, snapshot):
+    counts, total, count = snapshot
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+    yield f'{name}_bucket{{{labels},le="+Inf"}} {count}'
+    yield f"{name}_sum{{{labels}}} {total}"
+    yield f"{name}_count{{{labels}}} {count}"
+
+
+def render_prometheus():
+    snapshot = registry.snapshot()
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (route, method, status), (latency, *_rest) in snapshot.items():
+        labels = _labels(route=route, method=method, status=status)
+        lines.extend(
+            _histogram_lines(
+                "http_request_duration_seconds", labels, LATENCY_BUCKETS, latency
+            )
+        )
+    lines += [
+        "# HELP http_request_db_queries SQL queries issued per request.",
+        "# TYPE http_request_db_queries histogram",
+    ]
+    for (route, method, status), (_latency, queries, *_rest) in snapshot.items():
+        labels = _labels(route=route, method=method, status=status)
+        lines.extend(
+            _histogram_lines("http_request_db_queries", labels, QUERY_BUCKETS, queries)
+        )
+    for index, (metric, help_text) in enumerate(
+        [
+            ("http_request_db_seconds_total", "Time spent executing SQL."),
+            ("http_request_auth_seconds_total", "Time spent authenticating."),
+            ("http_request_serialize_seconds_total", "Time spent rendering."),
+        ]
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        for (route, method, status), values in snapshot.items():
+            labels = _labels(route=route, method=method, status=status)
+            lines.append(f"{metric}{{{labels}}} {values[2 + index]}")
+
+    pools = pool_stats()
+    for metric, key, kind in [
+        ("db_pool_connections_in_use", "in_use", "gauge"),
+        ("db_pool_connections_idle", "idle", "gauge"),
+        ("db_pool_connections_max", "max_size", "gauge"),
+        ("db_pool_waits_total", "waits", "counter"),
+        ("db_pool_wait_seconds_total", "wait_seconds", "counter"),
+        ("db_pool_timeouts_total", "timeouts", "counter"),
+    ]:
+        lines.append(f"# TYPE {metric} {kind}")
+        for (alias, name), stats in pools.items():
+            lines.append(f"{metric}{{{_labels(alias=alias, name=name)}}} {stats[key]}")
+
+    index_stats = get_membership_index().stats()
+    lines += [
+        "# TYPE membership_index_hits_total counter",
+        f"membership_index_hits_total {index_stats['hits']}",
+        "# TYPE membership_index_misses_total counter",
+        f"membership_index_misses_total {index_stats['misses']}",
+    ]
+    revocations = get_revocation_list()
+    lines += [
+        "# TYPE token_revocation_lookups_total counter",
+        f"token_revocation_lookups_total {revocations.lookups}",
+        "# TYPE token_revocation_filter_hits_total counter",
+        f"token_revocation_filter_hits_total {revocations.hits}",
+    ]
+    limiters = get_limiters().values()
+    for metric, attr, kind in [
+        ("concurrency_limit", "limit", "gauge"),
+        ("concurrency_in_flight", "in_flight", "gauge"),
+        ("concurrency_shed_total", "shed", "counter"),
+    ]:
+        lines.append(f"# TYPE {metric} {kind}")
+        for limiter in limiters:
+            value = getattr(limiter, attr)
+            lines.append(f"{metric}{{{_labels(route_class=limiter.name)}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token:
+        allowed = request.headers.get("Authorization") == f"Bearer {token}"
+    else:
+        allowed = request.META.get("REMOTE_ADDR") in getattr(
+            settings, "METRICS_ALLOWED_IPS", ()
+        )
+    if not allowed:
+        return HttpResponse(status=403)
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+class MetricsMiddleware:
+    """Record per-route latency, SQL count/time, auth and render time.
+
+    Render time covers ``Response.render`` whichever renderer is selected.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.debug_header = getattr(settings, "METRICS_DEBUG_HEADER", settings.DEBUG)
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(_count_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        registry.observe(route, request.method, response.status_code, elapsed, stats)
+        if self.debug_header:
+            response["X-Request-Metrics"] = (
+                f"total={elapsed * 1000:.2f}ms;db={stats.db * 1000:.2f}ms;"
+                f"queries={stats.queries};auth={stats.auth * 1000:.2f}ms;"
+                f"serialize={stats.serialize * 1000:.2f}ms"
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # Outermost, so this runs last, just before the handler renders.
+        start = time.perf_counter()
+        response.add_post_render_callback(
+            lambda _response: record("serialize", time.perf_counter() - start)
+        )
+        return response
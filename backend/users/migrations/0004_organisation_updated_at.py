@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_is_staff_user_is_superuser'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organisation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:39
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_organisation_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='users_user_email_upper_idx'),
+        ),
+        # The auto-created through table only indexes (organisation_id, user_id);
+        # membership lookups by user need the reverse order.
+        migrations.RunSQL(
+            sql='CREATE INDEX users_organisation_users_user_org_idx ON users_organisation_users (user_id, organisation_id)',
+            reverse_sql='DROP INDEX users_organisation_users_user_org_idx',
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:20
+
+from django.db import migrations
+
+# Expressions match the SQL Django emits for icontains on PostgreSQL,
+# UPPER("column"::text) LIKE UPPER(%s), so the planner can use the indexes.
+TRIGRAM_INDEXES = [
+    ('users_user_firstname_trgm_idx', 'users_user', 'firstName'),
+    ('users_user_lastname_trgm_idx', 'users_user', 'lastName'),
+    ('users_user_email_trgm_idx', 'users_user', 'email'),
+    ('users_organisation_name_trgm_idx', 'users_organisation', 'name'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
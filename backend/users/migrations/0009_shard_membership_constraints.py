@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+USER_ORG_INDEX = 'CREATE INDEX IF NOT EXISTS users_organisation_users_user_org_idx ON users_organisation_users (user_id, organisation_id)'
+
+
+def _user_fields(apps):
+    through = apps.get_model('users', 'Organisation')._meta.get_field('users').remote_field.through
+    old_field = through._meta.get_field('user')
+    new_field = models.ForeignKey(
+        old_field.remote_field.model, on_delete=models.CASCADE, db_constraint=False
+    )
+    new_field.set_attributes_from_name('user')
+    new_field.model = through
+    return through, old_field, new_field
+
+
+def _on_shard(schema_editor):
+    return schema_editor.connection.alias in getattr(settings, 'DATABASE_SHARDS', [])
+
+
+def drop_user_constraint_on_shards(apps, schema_editor):
+    # Membership rows on a shard point at users on ``default``; only the
+    # shards lose the user FK, ``default`` keeps both constraints.
+    if _on_shard(schema_editor):
+        through, old_field, new_field = _user_fields(apps)
+        schema_editor.alter_field(through, old_field, new_field)
+        # SQLite rebuilds the through table to alter it, dropping the index
+        # added by 0005 with RunSQL.
+        schema_editor.execute(USER_ORG_INDEX)
+
+
+def add_user_constraint_on_shards(apps, schema_editor):
+    if _on_shard(schema_editor):
+        through, old_field, new_field = _user_fields(apps)
+        schema_editor.alter_field(through, new_field, old_field)
+        schema_editor.execute(USER_ORG_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_task'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_user_constraint_on_shards, add_user_constraint_on_shards),
+    ]
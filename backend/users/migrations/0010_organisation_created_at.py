@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_shard_membership_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organisation',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='organisation',
+            index=models.Index(fields=['created_at', 'orgId'], name='users_org_created_idx'),
+        ),
+    ]
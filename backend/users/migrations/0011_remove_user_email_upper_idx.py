@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 22:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_organisation_created_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_user_email_upper_idx',
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
+from django.utils import timezone
+from backend.db.routers import group_by_shard, shard_aliases, shard_pk
+import hashlib
 import uuid
 
 
@@ -55,11 +58,88 @@ class User(AbstractBaseUser):
         return self.is_superuser
 
 
+class OrganisationQuerySet(models.QuerySet):
+    def create(self, **kwargs):
+        # Route through save() so ShardRouter sees the instance and its orgId.
+        organisation = self.model(**kwargs)
+        self._for_write = True
+        organisation.save(force_insert=True, using=self._db)
+        return organisation
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if self._db is not None or not shard_aliases():
+            return super().bulk_create(objs, *args, **kwargs)
+        # Unbound inserts are split by the shard each orgId hashes to.
+        objs = list(objs)
+        for alias, group in group_by_shard(objs, key=lambda org: org.orgId).items():
+            for organisation in group:
+                if organisation.pk is None:
+                    organisation.pk = shard_pk(organisation.orgId)
+            self.using(alias).bulk_create(group, *args, **kwargs)
+        return objs
+
+
 class Organisation(models.Model):
     orgId = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     users = models.ManyToManyField(User, related_name="organisations")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = OrganisationQuerySet.as_manager()
+
+    class Meta:
+        # List pages are ordered by (created_at, orgId): sharded primary keys
+        # are hashes and carry no order.
+        indexes = [
+            models.Index(fields=["created_at", "orgId"], name="users_org_created_idx")
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        if self.pk is None and shard_aliases():
+            self.pk = shard_pk(self.orgId)
+            kwargs.setdefault("force_insert", True)
+        super().save(*args, **kwargs)
+
+    @property
+    def etag(self):
+        version = f"{self.orgId}:{self.updated_at.isoformat()}"
+        return '"%s"' % hashlib.sha1(version.encode()).hexdigest()
+
+
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.jti
+
+
+class Task(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUS_CHOICES = [(QUEUED, "Queued"), (RUNNING, "Running"), (FAILED, "Failed")]
+
+    name = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="users_task_status_run_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,108 @@
+import binascii
+import uuid
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.utils.urls import replace_query_param
+
+from backend.db.routers import scatter
+
+# Sharded primary keys are hashes of orgId, so list order cannot use them.
+ORDERING = ("created_at", "orgId")
+
+
+def position_of(row):
+    """``(created_at, orgId)`` of an organisation or of a ``values()`` row."""
+    if isinstance(row, dict):
+        return row["created_at"], row["orgId"]
+    return row.created_at, row.orgId
+
+
+def organisation_page(queryset, position, size):
+    """Up to ``size`` organisations after ``position``, merged from every shard."""
+    queryset = queryset.order_by(*ORDERING)
+    if position is not None:
+        created_at, org_id = position
+        queryset = queryset.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, orgId__gt=org_id)
+        )
+    return scatter(queryset, key=position_of, limit=size)
+
+
+class OrganisationCursorPagination(CursorPagination):
+    """Forward-only keyset pages over ``(created_at, orgId)``.
+
+    Cursors keep DRF's encoding. Querysets may hold instances or ``values()``
+    rows, as long as rows include ``created_at`` and ``orgId``.
+    """
+
+    page_size = 100
+    page_size_query_param = "limit"
+    max_page_size = 1000
+    ordering = ORDERING
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        try:
+            position = decode_position(
+                request.query_params.get(self.cursor_query_param, "")
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        page = organisation_page(queryset, position, self.page_size + 1)
+        self.next_position = None
+        if len(page) > self.page_size:
+            page = page[: self.page_size]
+            self.next_position = position_of(page[-1])
+        return page
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            encode_position(self.next_position),
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "status": "success",
+                "message": "Organisations retrieved successfully",
+                "data": {
+                    "organisations": data,
+                    "next": self.get_next_link(),
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def encode_position(position):
+    """Encode a keyset position in the same format as DRF's cursor pagination."""
+    created_at, org_id = position
+    querystring = parse.urlencode({"p": f"{created_at.isoformat()}|{org_id}"})
+    return b64encode(querystring.encode("ascii")).decode("ascii")
+
+
+def decode_position(encoded):
+    querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+    tokens = parse.parse_qs(querystring, keep_blank_values=True)
+    if tokens.get("r", ["0"])[0] != "0" or tokens.get("o", ["0"])[0] != "0":
+        raise ValueError("Only forward cursors are supported")
+    position = tokens.get("p", [None])[0]
+    if position is None:
+        return None
+    created_at, _, org_id = position.partition("|")
+    created_at = parse_datetime(created_at)
+    if created_at is None:
+        raise ValueError("Invalid cursor position")
+    return created_at, uuid.UUID(org_id)
@@ -0,0 +1,44 @@
+from .serializers import UserSerializer, OrganisationSerializer
+
+
+class RowProjection:
+    """Model-free stand-in for a ModelSerializer on list endpoints.
+
+    ``queryset()`` fetches only the serialized columns as dicts and
+    ``render()`` turns them into the same output the ModelSerializer gives.
+    """
+
+    def __init__(self, fields, uuid_fields=(), extra=("id",)):
+        self.fields = list(fields)
+        self.uuid_fields = [f for f in uuid_fields if f in self.fields]
+        self.extra = extra
+        self.columns = [*extra, *(f for f in self.fields if f not in extra)]
+
+    def select(self, fields):
+        """Projection narrowed to ``fields``; ``None`` keeps every field."""
+        if fields is None:
+            return self
+        return RowProjection(fields, self.uuid_fields, self.extra)
+
+    def queryset(self, queryset):
+        return queryset.values(*self.columns)
+
+    def render(self, rows):
+        fields, uuid_fields = self.fields, self.uuid_fields
+        data = []
+        for row in rows:
+            item = {field: row[field] for field in fields}
+            for field in uuid_fields:
+                if item[field] is not None:
+                    item[field] = str(item[field])
+            data.append(item)
+        return data
+
+
+USER_PROJECTION = RowProjection(UserSerializer.Meta.fields, uuid_fields=["userId"])
+# List pages are keyed on (created_at, orgId), so rows always carry both.
+ORGANISATION_PROJECTION = RowProjection(
+    OrganisationSerializer.Meta.fields,
+    uuid_fields=["orgId"],
+    extra=("id", "created_at", "orgId"),
+)
@@ -0,0 +1,168 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def _config():
+    return getattr(settings, "TASKS", {})
+
+
+def task(name, max_attempts=None, batch=False):
+    """Register a handler for tasks called ``name``.
+
+    Batch handlers receive the list of payloads claimed together; others are
+    called once per payload. A handler that raises fails every task it was
+    given, so batch handlers should be safe to re-run for the whole list.
+    """
+
+    def register(fn):
+        _handlers[name] = (fn, max_attempts, batch)
+        return fn
+
+    return register
+
+
+def _max_attempts(name):
+    registered = _handlers.get(name)
+    if registered is not None and registered[1] is not None:
+        return registered[1]
+    return _config().get("MAX_ATTEMPTS", 5)
+
+
+def enqueue(name, payload=None, delay=None):
+    return enqueue_many([(name, payload or {})], delay=delay)[0]
+
+
+def enqueue_many(tasks, delay=None):
+    """Insert ``(name, payload)`` pairs in one statement.
+
+    Rows are written in the caller's transaction, so workers only see them
+    once it commits and a rolled-back request leaves nothing behind.
+    """
+    run_at = timezone.now() + (delay or timedelta())
+    return Task.objects.bulk_create(
+        [
+            Task(
+                name=name,
+                payload=payload,
+                max_attempts=_max_attempts(name),
+                run_at=run_at,
+            )
+            for name, payload in tasks
+        ]
+    )
+
+
+def claim(batch_size, lease):
+    """Lease up to ``batch_size`` due tasks to this worker.
+
+    Running tasks whose lease expired (a worker died mid-batch) are claimed
+    again. ``skip_locked`` lets several workers poll the same table.
+    """
+    now = timezone.now()
+    due = Q(status=Task.QUEUED, run_at__lte=now) | Q(
+        status=Task.RUNNING, locked_until__lt=now
+    )
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("run_at", "pk")[:batch_size]
+        )
+        for item in tasks:
+            item.status = Task.RUNNING
+            item.attempts += 1
+            item.locked_until = now + timedelta(seconds=lease)
+        Task.objects.bulk_update(tasks, ["status", "attempts", "locked_until"])
+    return tasks
+
+
+def _retry(tasks, error):
+    now = timezone.now()
+    backoff = _config().get("RETRY_BACKOFF", 10)
+    for item in tasks:
+        item.last_error = error
+        item.locked_until = None
+        if item.attempts >= item.max_attempts:
+            item.status = Task.FAILED
+            logger.error("Task %s #%s failed: %s", item.name, item.pk, error)
+        else:
+            item.status = Task.QUEUED
+            item.run_at = now + timedelta(seconds=backoff * 2 ** (item.attempts - 1))
+    Task.objects.bulk_update(
+        tasks, ["status", "run_at", "locked_until", "last_error", "max_attempts"]
+    )
+
+
+def _requeue_unknown(name, tasks):
+    """Put back tasks this worker has no handler for, without using an attempt.
+
+    During a rolling deploy new web processes can enqueue tasks that only the
+    new workers know, so an old worker leaves them for later.
+    """
+    run_at = timezone.now() + timedelta(seconds=_config().get("RETRY_BACKOFF", 10))
+    error = f"No handler registered for {name!r}"
+    logger.warning("%s; requeued %d task(s)", error, len(tasks))
+    for item in tasks:
+        item.attempts -= 1
+        item.status = Task.QUEUED
+        item.run_at = run_at
+        item.locked_until = None
+        item.last_error = error
+    Task.objects.bulk_update(
+        tasks, ["status", "attempts", "run_at", "locked_until", "last_error"]
+    )
+
+
+def _execute(name, tasks):
+    registered = _handlers.get(name)
+    if registered is None:
+        _requeue_unknown(name, tasks)
+        return 0
+    handler, max_attempts, batch = registered
+    if max_attempts is not None:
+        # The web process may enqueue before this module imported the handler.
+        for item in tasks:
+            item.max_attempts = max_attempts
+    done, failed = [], {}
+    if batch:
+        try:
+            handler([item.payload for item in tasks])
+            done = tasks
+        except Exception as exc:
+            failed[repr(exc)] = tasks
+    else:
+        for item in tasks:
+            try:
+                handler(item.payload)
+                done.append(item)
+            except Exception as exc:
+                failed.setdefault(repr(exc), []).append(item)
+    Task.objects.filter(pk__in=[item.pk for item in done]).delete()
+    for error, items in failed.items():
+        _retry(items, error)
+    return len(done)
+
+
+def run_pending(batch_size=None, lease=None):
+    """Claim one batch, run it grouped by task name and return tasks completed."""
+    from . import tasks as _tasks  # noqa: F401  (handlers register on import)
+
+    config = _config()
+    tasks = claim(
+        batch_size or config.get("BATCH_SIZE", 100), lease or config.get("LEASE", 300)
+    )
+    groups = {}
+    for item in tasks:
+        groups.setdefault(item.name, []).append(item)
+    return sum(_execute(name, items) for name, items in groups.items())
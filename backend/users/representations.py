@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import User, Organisation
+from .serializers import UserSerializer, OrganisationSerializer
+
+
+class RepresentationCache:
+    """Serialized ``UserSerializer``/``OrganisationSerializer`` output by public id.
+
+    Entries are plain dicts (``pk`` plus the rendered ``data``) so views can
+    splice them into the response envelope without touching the database.
+    """
+
+    def __init__(self, cache_alias, ttl):
+        self.cache = caches[cache_alias]
+        self.ttl = ttl
+
+    def key(self, kind, ident):
+        return f"repr:{kind}:{ident}"
+
+    def get(self, kind, ident):
+        return self.cache.get(self.key(kind, ident))
+
+    def set(self, kind, ident, entry):
+        self.cache.set(self.key(kind, ident), entry, self.ttl)
+
+    def delete(self, kind, ident):
+        self.cache.delete(self.key(kind, ident))
+
+
+_representation_cache = None
+
+
+def get_representation_cache():
+    global _representation_cache
+    if _representation_cache is None:
+        config = getattr(settings, "REPRESENTATION_CACHE", {})
+        _representation_cache = RepresentationCache(
+            cache_alias=config.get("CACHE_ALIAS", "default"),
+            ttl=config.get("TTL", 300),
+        )
+    return _representation_cache
+
+
+def user_entry(user):
+    entry = {"pk": user.pk, "data": dict(UserSerializer(user).data)}
+    get_representation_cache().set("user", user.userId, entry)
+    return entry
+
+
+def organisation_entry(organisation):
+    entry = {
+        "pk": organisation.pk,
+        "etag": organisation.etag,
+        "data": dict(OrganisationSerializer(organisation).data),
+    }
+    get_representation_cache().set("organisation", organisation.orgId, entry)
+    return entry
+
+
+def user_representation(user):
+    entry = get_representation_cache().get("user", user.userId)
+    return (entry or user_entry(user))["data"]
+
+
+def get_user_entry(user_id):
+    entry = get_representation_cache().get("user", user_id)
+    if entry is None:
+        try:
+            entry = user_entry(User.objects.get(userId=user_id))
+        except User.DoesNotExist:
+            return None
+    return entry
+
+
+def get_organisation_entry(org_id):
+    return get_representation_cache().get("organisation", org_id)
+
+
+def invalidate_user(user):
+    get_representation_cache().delete("user", user.userId)
+
+
+def invalidate_organisation(organisation):
+    get_representation_cache().delete("organisation", organisation.orgId)
@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone as django_timezone
+
+from .cache import TTLCache
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class RevocationList:
+    """Revoked token ids, answered from an in-process Bloom filter.
+
+    The filter is rebuilt from ``RevokedToken`` every ``rebuild_interval``
+    seconds; only ids that hit the filter are confirmed against the table, so
+    tokens that were never revoked cost no queries. Revocations made by other
+    processes become visible after their next rebuild.
+
+    Only the first filter is built on a request thread, when the process
+    starts its first request. Later rebuilds run on a background thread while
+    requests keep using the current filter.
+    """
+
+    def __init__(self, rebuild_interval, capacity, error_rate, confirm_cache_size):
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.confirmed = TTLCache(confirm_cache_size, rebuild_interval)
+        self.filter = None
+        self.built_at = 0.0
+        self.hits = 0
+        self.lookups = 0
+        self._recent = {}
+        self._lock = threading.Lock()
+
+    def is_stale(self):
+        return time.monotonic() - self.built_at >= self.rebuild_interval
+
+    def rebuild(self):
+        if not self._lock.acquire(blocking=False):
+            # Someone else is rebuilding; keep serving the current filter.
+            return
+        try:
+            self._build()
+        finally:
+            self._lock.release()
+
+    def refresh(self):
+        """Bring a stale filter up to date without making the caller wait.
+
+        Without a filter yet, concurrent callers wait for a single inline
+        build rather than each querying the table.
+        """
+        if self.filter is None:
+            with self._lock:
+                if self.filter is None:
+                    self._build()
+        elif self._lock.acquire(blocking=False):
+            # The lock is released by the rebuild thread when it finishes.
+            threading.Thread(
+                target=self._rebuild_in_background,
+                name="token-revocation-rebuild",
+                daemon=True,
+            ).start()
+
+    def _rebuild_in_background(self):
+        try:
+            self._build()
+        except Exception:
+            logger.exception("Rebuilding the token revocation filter failed")
+        finally:
+            self._lock.release()
+            connections.close_all()
+
+    def _build(self):
+        jtis = list(
+            RevokedToken.objects.filter(
+                expires_at__gt=django_timezone.now()
+            ).values_list("jti", flat=True)
+        )
+        bloom = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        # Local revocations may have committed after the snapshot was read.
+        now = django_timezone.now()
+        for jti, expires_at in list(self._recent.items()):
+            if expires_at > now:
+                bloom.add(jti)
+            else:
+                self._recent.pop(jti, None)
+        self.filter = bloom
+        self.confirmed.clear()
+        self.built_at = time.monotonic()
+
+    def might_be_revoked(self, jti):
+        self.lookups += 1
+        bloom = self.filter
+        if bloom is not None and jti not in bloom:
+            return False
+        self.hits += 1
+        return True
+
+    def confirm(self, jti):
+        revoked = self.confirmed.get(jti)
+        if revoked is None:
+            revoked = RevokedToken.objects.filter(
+                jti=jti, expires_at__gt=django_timezone.now()
+            ).exists()
+            self.confirmed.set(jti, revoked)
+        return revoked
+
+    def is_revoked(self, jti):
+        if self.is_stale():
+            self.refresh()
+        return self.might_be_revoked(jti) and self.confirm(jti)
+
+    def revoke(self, jti, expires_at):
+        RevokedToken.objects.update_or_create(
+            jti=jti, defaults={"expires_at": expires_at}
+        )
+        self._recent[jti] = expires_at
+        if self.filter is not None:
+            self.filter.add(jti)
+        self.confirmed.set(jti, True)
+
+    def clear(self):
+        self.filter = None
+        self.built_at = 0.0
+        self.hits = self.lookups = 0
+        self._recent.clear()
+        self.confirmed.clear()
+
+
+def token_expiry(token):
+    return datetime.fromtimestamp(token["exp"], tz=timezone.utc)
+
+
+def purge_expired():
+    deleted, _ = RevokedToken.objects.filter(
+        expires_at__lte=django_timezone.now()
+    ).delete()
+    return deleted
+
+
+_revocation_list = None
+
+
+def get_revocation_list():
+    global _revocation_list
+    if _revocation_list is None:
+        config = getattr(settings, "TOKEN_REVOCATION", {})
+        _revocation_list = RevocationList(
+            rebuild_interval=config.get("REBUILD_INTERVAL", 30),
+            capacity=config.get("CAPACITY", 100000),
+            error_rate=config.get("ERROR_RATE", 0.001),
+            confirm_cache_size=config.get("CONFIRM_CACHE_SIZE", 10000),
+        )
+    return _revocation_list
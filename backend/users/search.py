@@ -0,0 +1,219 @@
+import heapq
+import threading
+import time
+from itertools import chain
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Exists, IntegerField, OuterRef, Q, Value, When
+
+from backend.db.routers import each_shard, scatter, shard_aliases
+
+from .membership import Membership, get_membership_index
+from .models import User, Organisation
+from .projections import ORGANISATION_PROJECTION, USER_PROJECTION
+
+MIN_QUERY_LENGTH = 3
+
+SEARCH_FIELDS = {
+    User: ("firstName", "lastName", "email"),
+    Organisation: ("name",),
+}
+
+
+def trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class NgramIndex:
+    """In-process trigram index for databases without pg_trgm.
+
+    Meant for SQLite development databases: postings are plain sets, so memory
+    grows with the number of rows. The index is built on first use, patched by
+    the save/delete receivers in ``users.signals`` and rebuilt after ``ttl``
+    seconds to pick up bulk inserts, which send no signals.
+    """
+
+    def __init__(self, model, fields, ttl):
+        self.model = model
+        self.fields = fields
+        self.ttl = ttl
+        self.docs = None
+        self.postings = {}
+        self.built_at = 0.0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _is_fresh(self):
+        return self.docs is not None and time.monotonic() - self.built_at < self.ttl
+
+    def _ensure_built(self):
+        if self._is_fresh():
+            return
+        with self._build_lock:
+            if not self._is_fresh():
+                self._build()
+
+    def _build(self):
+        docs, postings = {}, {}
+        rows = chain.from_iterable(
+            shard.iterator(chunk_size=2000)
+            for shard in each_shard(self.model.objects.values_list("pk", *self.fields))
+        )
+        for pk, *values in rows:
+            docs[pk] = self._normalise(values)
+            for gram in self._grams(docs[pk]):
+                postings.setdefault(gram, set()).add(pk)
+        with self._lock:
+            self.docs, self.postings = docs, postings
+            self.built_at = time.monotonic()
+
+    @staticmethod
+    def _normalise(values):
+        return tuple((value or "").lower() for value in values)
+
+    @staticmethod
+    def _grams(values):
+        grams = set()
+        for value in values:
+            grams |= trigrams(value)
+        return grams
+
+    def update(self, instance):
+        if self.docs is None:
+            return
+        values = self._normalise(getattr(instance, field) for field in self.fields)
+        with self._lock:
+            self._discard(instance.pk)
+            self.docs[instance.pk] = values
+            for gram in self._grams(values):
+                self.postings.setdefault(gram, set()).add(instance.pk)
+
+    def remove(self, pk):
+        if self.docs is None:
+            return
+        with self._lock:
+            self._discard(pk)
+
+    def _discard(self, pk):
+        values = self.docs.pop(pk, None)
+        if values is not None:
+            for gram in self._grams(values):
+                self.postings.get(gram, set()).discard(pk)
+
+    def clear(self):
+        with self._lock:
+            self.docs = None
+            self.postings = {}
+
+    def search(self, query, limit, allowed=None):
+        """Return up to ``limit`` pks containing ``query``, prefix matches first."""
+        self._ensure_built()
+        query = query.lower()
+        with self._lock:
+            postings = sorted(
+                (self.postings.get(gram, set()) for gram in trigrams(query)), key=len
+            )
+            candidates = postings[0].intersection(*postings[1:])
+            if allowed is not None:
+                candidates &= allowed
+            matches = []
+            for pk in candidates:
+                values = self.docs[pk]
+                if any(query in value for value in values):
+                    rank = 0 if any(value.startswith(query) for value in values) else 1
+                    matches.append((rank, pk))
+        return [pk for _rank, pk in heapq.nsmallest(limit, matches)]
+
+
+_indexes = {}
+
+
+def get_ngram_index(model):
+    index = _indexes.get(model)
+    if index is None:
+        config = getattr(settings, "SEARCH", {})
+        index = _indexes[model] = NgramIndex(
+            model, SEARCH_FIELDS[model], ttl=config.get("NGRAM_TTL", 300)
+        )
+    return index
+
+
+def use_database():
+    backend = getattr(settings, "SEARCH", {}).get("BACKEND", "auto")
+    if backend == "auto":
+        return connection.vendor == "postgresql"
+    return backend == "database"
+
+
+def _database_search(queryset, fields, query):
+    # On PostgreSQL the icontains filters hit the pg_trgm GIN indexes.
+    matches = Q()
+    prefix = Q()
+    for field in fields:
+        matches |= Q(**{f"{field}__icontains": query})
+        prefix |= Q(**{f"{field}__istartswith": query})
+    return (
+        queryset.filter(matches)
+        .annotate(
+            search_rank=Case(
+                When(prefix, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("search_rank", "pk")
+    )
+
+
+def _search(model, projection, queryset, allowed, query, limit):
+    if use_database():
+        queryset = _database_search(queryset, SEARCH_FIELDS[model], query)
+        rows = queryset.values(*projection.columns, "search_rank")
+        return projection.render(
+            scatter(rows, key=itemgetter("search_rank", "id"), limit=limit)
+        )
+    pks = get_ngram_index(model).search(query, limit, allowed)
+    rows = {
+        row["id"]: row
+        for row in scatter(projection.queryset(model.objects.filter(pk__in=pks)))
+    }
+    return projection.render(rows[pk] for pk in pks if pk in rows)
+
+
+def _sees_everything(user):
+    return user.is_staff or user.is_superuser
+
+
+def search_users(user, query, limit):
+    """Users matching ``query`` that ``user`` may view: co-members, or all for staff."""
+    if _sees_everything(user):
+        return _search(User, USER_PROJECTION, User.objects.all(), None, query, limit)
+    org_ids = get_membership_index().org_ids(user.pk)
+    memberships = Membership.objects.filter(organisation_id__in=org_ids)
+    if shard_aliases():
+        # Memberships live on the shards, so collect co-member ids there.
+        co_members = Q(
+            pk__in=set(scatter(memberships.values_list("user_id", flat=True)))
+        )
+    else:
+        co_members = Exists(memberships.filter(user=OuterRef("pk")))
+    queryset = User.objects.filter(Q(pk=user.pk) | co_members)
+    allowed = None if use_database() else set(queryset.values_list("pk", flat=True))
+    return _search(User, USER_PROJECTION, queryset, allowed, query, limit)
+
+
+def search_organisations(user, query, limit):
+    """Organisations matching ``query`` that ``user`` belongs to, or all for staff."""
+    if _sees_everything(user):
+        queryset, allowed = Organisation.objects.all(), None
+    else:
+        allowed = set(get_membership_index().org_ids(user.pk))
+        queryset = Organisation.objects.filter(pk__in=allowed)
+    return _search(
+        Organisation, ORGANISATION_PROJECTION, queryset, allowed, query, limit
+    )
+
+
+SEARCH_TYPES = {"users": search_users, "organisations": search_organisations}
@@ -1,10 +1,49 @@
+from contextlib import nullcontext
+
 from django.contrib.auth import authenticate
+from django.db import transaction
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import serializers
+from backend.db.routers import group_by_shard, shard_pk, stick_user
 from .models import User, Organisation
+from .membership import BULK_CHUNK_SIZE, Membership, get_membership_index
+from .queue import enqueue_many
+from . import hashing
+
+
+def query_params(request):
+    return getattr(request, "query_params", None) or request.GET
+
+
+def requested_fields(request, available):
+    """Names from ``?fields=a,b`` in ``available`` order, or None for all fields.
+
+    Unknown names are ignored.
+    """
+    raw = query_params(request).get("fields") if request is not None else None
+    if not raw:
+        return None
+    wanted = {name.strip() for name in raw.split(",")}
+    return [name for name in available if name in wanted]
+
+
+def sparse(data, fields):
+    return data if fields is None else {name: data[name] for name in fields}
+
+
+class SparseFieldsMixin:
+    """Honour ``?fields=`` on reads for the request in the serializer context."""
 
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        request = self.context.get("request")
+        if request is None or request.method not in ("GET", "HEAD"):
+            return names
+        fields = requested_fields(request, names)
+        return names if fields is None else fields
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     userId = serializers.UUIDField(read_only=True)
 
     class Meta:
@@ -46,15 +85,41 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
-        user = User(
-            email=validated_data["email"],
-            firstName=validated_data["firstName"],
-            lastName=validated_data["lastName"],
-            phone=validated_data.get("phone", ""),
+        return register_users([validated_data])[0]
+
+
+class BulkRegistrationEntrySerializer(UserRegistrationSerializer):
+    class Meta(UserRegistrationSerializer.Meta):
+        # Uniqueness is checked once for the whole batch.
+        extra_kwargs = {
+            "password": {"write_only": True},
+            "email": {"validators": []},
+        }
+
+
+class BulkUserRegistrationSerializer(serializers.Serializer):
+    users = BulkRegistrationEntrySerializer(
+        many=True, allow_empty=False, max_length=1000
+    )
+
+    def validate_users(self, users):
+        emails = [user["email"] for user in users]
+        duplicates = {email for email in emails if emails.count(email) > 1}
+        if duplicates:
+            raise serializers.ValidationError(
+                f"Duplicate emails in request: {', '.join(sorted(duplicates))}"
+            )
+        taken = set(
+            User.objects.filter(email__in=emails).values_list("email", flat=True)
         )
-        user.set_password(validated_data["password"])
-        user.save()
-        return user
+        if taken:
+            raise serializers.ValidationError(
+                f"Emails already registered: {', '.join(sorted(taken))}"
+            )
+        return users
+
+    def create(self, validated_data):
+        return register_users(validated_data["users"])
 
 
 class LoginSerializer(serializers.Serializer):
@@ -89,7 +154,7 @@ class LoginSerializer(serializers.Serializer):
         }
 
 
-class OrganisationSerializer(serializers.ModelSerializer):
+class OrganisationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     name = serializers.CharField(read_only=True)
 
     class Meta:
@@ -102,17 +167,93 @@ class OrganisationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context["request"].user
         validated_data["name"] = self.naming_org(user)
-        organisation = Organisation.objects.create(**validated_data)
+        # save() rather than objects.create() so ShardRouter sees the orgId.
+        organisation = Organisation(**validated_data)
+        organisation.save()
         organisation.users.add(user)
         return organisation
 
 
+def register_users(entries):
+    """Create users with their default organisation and membership.
+
+    Passwords are hashed before the transaction opens, so it only spans the
+    inserts (users, organisations, memberships, queued tasks) whatever the
+    batch size. Welcome emails and cache warming run later in ``run_tasks``.
+    """
+    passwords = hashing.make_passwords(entry["password"] for entry in entries)
+    users = [
+        User(
+            email=entry["email"],
+            firstName=entry["firstName"],
+            lastName=entry["lastName"],
+            phone=entry.get("phone", ""),
+            password=password,
+        )
+        for entry, password in zip(entries, passwords)
+    ]
+    naming_org = OrganisationSerializer().naming_org
+    organisations = [Organisation(name=naming_org(user)) for user in users]
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=BULK_CHUNK_SIZE)
+        shards = group_by_shard(
+            zip(users, organisations), key=lambda pair: pair[1].orgId
+        )
+        for alias, pairs in shards.items():
+            # Shard transactions commit just before the users one; there is no
+            # two-phase commit across databases.
+            with transaction.atomic(using=alias) if alias else nullcontext():
+                _create_default_organisations(alias, pairs)
+        user_ids = [user.pk for user in users]
+        enqueue_many(
+            [("users.send_welcome_email", {"user": pk}) for pk in user_ids]
+            + [
+                (
+                    "users.warm_representations",
+                    {"organisation": str(organisation.orgId)},
+                )
+                for organisation in organisations
+            ]
+        )
+        transaction.on_commit(lambda: _registered(user_ids))
+    return users
+
+
+def _create_default_organisations(alias, pairs):
+    if alias:
+        for _user, organisation in pairs:
+            organisation.pk = shard_pk(organisation.orgId)
+    Organisation.objects.using(alias).bulk_create(
+        [organisation for _user, organisation in pairs], batch_size=BULK_CHUNK_SIZE
+    )
+    Membership.objects.using(alias).bulk_create(
+        [
+            Membership(user_id=user.pk, organisation_id=organisation.pk)
+            for user, organisation in pairs
+        ],
+        batch_size=BULK_CHUNK_SIZE,
+    )
+
+
+def _registered(user_ids):
+    # bulk_create skips signals; drop any index entry left under a reused pk.
+    get_membership_index().invalidate(user_ids)
+    for user_id in user_ids:
+        stick_user(user_id)
+
+
 class AddUserToOrganisationSerializer(serializers.Serializer):
     userId = serializers.UUIDField()
 
-    def validate_userId(self, value):
+    def validate(self, data):
         try:
-            user = User.objects.get(userId=value)
+            data["user"] = User.objects.get(userId=data["userId"])
         except User.DoesNotExist:
-            raise serializers.ValidationError("User does not exist.")
-        return value
+            raise serializers.ValidationError({"userId": "User does not exist."})
+        return data
+
+
+class BulkAddUsersToOrganisationSerializer(serializers.Serializer):
+    userIds = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=10000
+    )
@@ -0,0 +1,95 @@
+from django.core.signals import request_started
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from backend.db.routers import scatter, shard_aliases
+
+from .authentication import get_user_cache
+from .membership import Membership, get_membership_index, member_ids
+from .models import User, Organisation
+from .representations import invalidate_organisation, invalidate_user
+from .revocation import get_revocation_list
+from .search import get_ngram_index
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    get_user_cache().delete(getattr(instance, api_settings.USER_ID_FIELD))
+    invalidate_user(instance)
+
+
+@receiver([post_save, post_delete], sender=Organisation)
+def invalidate_organisation_representation(sender, instance, **kwargs):
+    invalidate_organisation(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Organisation)
+def update_search_index(sender, instance, **kwargs):
+    get_ngram_index(sender).update(instance)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Organisation)
+def remove_from_search_index(sender, instance, **kwargs):
+    get_ngram_index(sender).remove(instance.pk)
+
+
+@receiver(m2m_changed, sender=Membership)
+def update_membership_index(sender, instance, action, reverse, pk_set, **kwargs):
+    index = get_membership_index()
+    if action in ("post_add", "post_remove"):
+        if reverse:
+            user_ids, org_ids = [instance.pk], pk_set
+        else:
+            user_ids, org_ids = pk_set, [instance.pk]
+        if action == "post_add":
+            index.add(user_ids, org_ids)
+        else:
+            index.remove(user_ids, org_ids)
+    elif action == "pre_clear":
+        if reverse:
+            index.invalidate([instance.pk])
+        else:
+            index.invalidate(member_ids(instance))
+
+
+@receiver(m2m_changed, sender=Membership)
+def invalidate_membership_representations(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        invalidate_organisation(instance)
+        return
+    organisations = Organisation.objects.only("orgId")
+    if action == "pre_clear":
+        organisations = organisations.filter(users=instance)
+    else:
+        organisations = organisations.filter(pk__in=pk_set)
+    for organisation in scatter(organisations):
+        invalidate_organisation(organisation)
+
+
+@receiver(pre_delete, sender=Organisation)
+def drop_deleted_organisation(sender, instance, **kwargs):
+    get_membership_index().invalidate(member_ids(instance))
+
+
+@receiver(post_delete, sender=User)
+def drop_deleted_user(sender, instance, **kwargs):
+    # Shards hold no foreign key to users, so the delete did not cascade there.
+    for alias in shard_aliases():
+        Membership.objects.using(alias).filter(user_id=instance.pk).delete()
+    get_membership_index().invalidate([instance.pk])
+
+
+@receiver(request_started)
+def build_revocation_filter(sender, **kwargs):
+    # A process's first filter is built before the view runs; later rebuilds
+    # happen in the background (see RevocationList.refresh).
+    revocations = get_revocation_list()
+    if revocations.filter is None:
+        revocations.refresh()
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from backend.db.routers import group_by_shard
+
+from .models import User, Organisation
+from .queue import task
+from .representations import organisation_entry, user_entry
+
+
+def organisations_by_org_id(org_ids):
+    found = {}
+    for alias, ids in group_by_shard(set(org_ids), key=str).items():
+        found.update(
+            (str(organisation.orgId), organisation)
+            for organisation in Organisation.objects.using(alias).filter(orgId__in=ids)
+        )
+    return found
+
+
+@task("users.send_welcome_email", batch=True)
+def send_welcome_email(payloads):
+    users = User.objects.filter(pk__in=[payload["user"] for payload in payloads])
+    messages = [
+        EmailMessage(
+            subject="Welcome",
+            body=f"Hi {user.firstName}, your account is ready.",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user.email],
+        )
+        for user in users.only("firstName", "email")
+    ]
+    # One connection for the whole batch instead of one per registration.
+    with get_connection() as connection:
+        connection.send_messages(messages)
+
+
+@task("users.send_membership_email", batch=True)
+def send_membership_email(payloads):
+    organisations = organisations_by_org_id(
+        payload["organisation"] for payload in payloads
+    )
+    users = User.objects.only("firstName", "email").in_bulk(
+        {user_id for payload in payloads for user_id in payload["users"]}
+    )
+    messages = [
+        EmailMessage(
+            subject=f"You were added to {organisations[payload['organisation']].name}",
+            body=f"Hi {users[user_id].firstName}, you now have access to "
+            f"{organisations[payload['organisation']].name}.",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[users[user_id].email],
+        )
+        for payload in payloads
+        if payload["organisation"] in organisations
+        for user_id in payload["users"]
+        if user_id in users
+    ]
+    with get_connection() as connection:
+        connection.send_messages(messages)
+
+
+@task("users.warm_representations", batch=True)
+def warm_representations(payloads):
+    user_ids = [payload["user"] for payload in payloads if "user" in payload]
+    org_ids = [
+        payload["organisation"] for payload in payloads if "organisation" in payload
+    ]
+    for user in User.objects.filter(pk__in=user_ids):
+        user_entry(user)
+    for organisation in organisations_by_org_id(org_ids).values():
+        organisation_entry(organisation)
@@ -0,0 +1,165 @@
+import uuid
+from django.conf import settings
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from users.authentication import get_user_cache
+from users.membership import Membership, get_membership_index, member_ids
+from users.models import User, Organisation
+
+
+@override_settings(ROOT_URLCONF="users.async_urls")
+class AsyncViewsTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        get_user_cache().clear()
+        get_membership_index().clear()
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            email="user1@example.com",
+            firstName="User",
+            lastName="One",
+            password="password123",
+        )
+        self.user2 = User.objects.create_user(
+            email="user2@example.com",
+            firstName="User",
+            lastName="Two",
+            password="password123",
+        )
+        self.organisation = Organisation.objects.create(name="Org1")
+        self.organisation.users.add(self.user1)
+
+    def auth(self, user):
+        return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def test_login(self):
+        response = self.client.post(
+            reverse("login"),
+            {"email": "user1@example.com", "password": "password123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["user"]["userId"], str(self.user1.userId))
+        self.assertIn("accessToken", data)
+
+        response = self.client.post(
+            reverse("login"),
+            {"email": "user1@example.com", "password": "wrong"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_login_goes_through_serializer_and_backends(self):
+        failures = []
+
+        def on_failure(sender, credentials, **kwargs):
+            failures.append(credentials)
+
+        user_login_failed.connect(on_failure, dispatch_uid="async-login-test")
+        self.addCleanup(user_login_failed.disconnect, dispatch_uid="async-login-test")
+        response = self.client.post(
+            reverse("login"),
+            {"email": "user1@example.com", "password": "wrong"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(len(failures), 1)
+        response = self.client.post(
+            reverse("login"),
+            {"email": "not-an-email", "password": "password123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_routes_match_sync_urls(self):
+        from users import async_urls, urls
+
+        self.assertEqual(
+            [getattr(p, "name", None) for p in async_urls.urlpatterns],
+            [getattr(p, "name", None) for p in urls.urlpatterns],
+        )
+
+    def test_requires_token(self):
+        url = reverse("user-detail", args=[self.user1.userId])
+        self.assertEqual(self.client.get(url).status_code, 401)
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer garbage")
+        self.assertEqual(response.status_code, 401)
+
+    def test_user_detail_permissions(self):
+        url = reverse("user-detail", args=[self.user1.userId])
+        self.assertEqual(self.client.get(url, **self.auth(self.user1)).status_code, 200)
+        self.assertEqual(self.client.get(url, **self.auth(self.user2)).status_code, 403)
+        missing = reverse("user-detail", args=[uuid.uuid4()])
+        self.assertEqual(
+            self.client.get(missing, **self.auth(self.user1)).status_code, 404
+        )
+
+    def test_organisation_list_and_detail(self):
+        second = Organisation.objects.create(name="Org2")
+        second.users.add(self.user1)
+        url = reverse("organisation-list-create")
+        response = self.client.get(url, {"limit": 1}, **self.auth(self.user1))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()["data"]
+        self.assertEqual([o["name"] for o in body["organisations"]], ["Org1"])
+        response = self.client.get(body["next"], **self.auth(self.user1))
+        body = response.json()["data"]
+        self.assertEqual([o["name"] for o in body["organisations"]], ["Org2"])
+        self.assertIsNone(body["next"])
+
+        detail = reverse("organisation-detail", args=[self.organisation.orgId])
+        response = self.client.get(detail, **self.auth(self.user1))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            detail, HTTP_IF_NONE_MATCH=response["ETag"], **self.auth(self.user1)
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(
+            self.client.get(detail, **self.auth(self.user2)).status_code, 403
+        )
+
+    def test_create_organisation_still_served(self):
+        response = self.client.post(
+            reverse("organisation-list-create"),
+            {"description": "new"},
+            content_type="application/json",
+            **self.auth(self.user2),
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_add_user(self):
+        url = reverse("add-user-to-organisation", args=[self.organisation.orgId])
+        response = self.client.post(
+            url,
+            {"userId": str(self.user2.userId)},
+            content_type="application/json",
+            **self.auth(self.user1),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.user2.pk, member_ids(self.organisation))
+        response = self.client.post(
+            url,
+            {"userId": "not-a-uuid"},
+            content_type="application/json",
+            **self.auth(self.user1),
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_user_detail_sparse_fields(self):
+        url = reverse("user-detail", args=[self.user1.userId])
+        response = self.client.get(url, {"fields": "email"}, **self.auth(self.user1))
+        self.assertEqual(response.json()["data"], {"email": "user1@example.com"})
+
+    def test_organisation_detail_checks_membership_on_cache_hits(self):
+        url = reverse("organisation-detail", args=[self.organisation.orgId])
+        response = self.client.get(url, {"fields": "name"}, **self.auth(self.user1))
+        self.assertEqual(response.json()["data"], {"name": "Org1"})
+        Membership.objects.using(self.organisation._state.db).filter(
+            user_id=self.user1.pk
+        ).delete()
+        self.assertEqual(self.client.get(url, **self.auth(self.user1)).status_code, 403)
@@ -1,10 +1,14 @@
-import unittest
+from django.conf import settings
+from django.test import TestCase
 from rest_framework.test import APIClient
 from django.urls import reverse
+from backend.db.routers import scatter
 from users.models import User, Organisation
 
 
-class AuthRegisterTestCase(unittest.TestCase):
+class AuthRegisterTestCase(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
     def setUp(self):
         self.client = APIClient()
         self.register_url = reverse("register")
@@ -30,7 +34,7 @@ class AuthRegisterTestCase(unittest.TestCase):
         # Verify the default organisation name
         user = User.objects.get(email=self.valid_user_data["email"])
         self.assertTrue(
-            Organisation.objects.filter(name="John's Organisation", users=user).exists()
+            scatter(Organisation.objects.filter(name="John's Organisation", users=user))
         )
 
     def test_login_user_successfully(self):
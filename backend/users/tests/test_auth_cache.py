@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from users.authentication import (
+    CachedJWTAuthentication,
+    UserCache,
+    get_user_cache,
+)
+from users.models import User
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        get_user_cache().clear()
+        self.user = User.objects.create_user(
+            email="cached@example.com",
+            firstName="Cached",
+            lastName="User",
+            password="password123",
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.auth = CachedJWTAuthentication()
+
+    def test_hot_user_needs_no_queries(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.auth.get_user(self.token), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.auth.get_user(self.token), self.user)
+
+    def test_save_invalidates_cached_user(self):
+        self.auth.get_user(self.token)
+        self.user.firstName = "Renamed"
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.auth.get_user(self.token).firstName, "Renamed")
+
+    def test_cached_copies_are_independent(self):
+        self.auth.get_user(self.token)
+        first = self.auth.get_user(self.token)
+        first.firstName = "Mutated"
+        self.assertEqual(self.auth.get_user(self.token).firstName, "Cached")
+
+    def test_process_local_cache_keeps_users_briefly(self):
+        # Other workers' saves cannot evict this copy, so it must expire soon.
+        self.assertLessEqual(settings.USER_AUTH_CACHE["TTL"], 5)
+        cache = UserCache(max_size=10, ttl=60, cache_alias="default", local_ttl=5)
+        self.assertEqual(cache.local.ttl, 5)
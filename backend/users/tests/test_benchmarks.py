@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from backend.db.routers import scatter
+from users.benchmarks import compare, generate_dataset, percentile
+from users.membership import Membership
+from users.models import User, Organisation, Task
+
+
+class BenchmarkSuiteTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def test_generate_dataset(self):
+        summary = generate_dataset(
+            users=50, organisations=10, max_members=20, seed=1, batch_size=16
+        )
+        self.assertEqual(User.objects.count(), 50)
+        self.assertEqual(len(scatter(Organisation.objects.all())), 10)
+        self.assertEqual(len(scatter(Membership.objects.all())), summary["memberships"])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_compare_flags_regressions(self):
+        baseline = [
+            {
+                "endpoint": "api/organisations",
+                "throughput_rps": 100.0,
+                "p50_ms": 1.0,
+                "p95_ms": 2.0,
+                "p99_ms": 3.0,
+                "max_queries": 1,
+            }
+        ]
+        current = [dict(baseline[0], p95_ms=3.0, max_queries=2)]
+        regressions = compare(current, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(compare(baseline, baseline), [])
+
+    def test_benchmark_command_removes_registrations(self):
+        generate_dataset(users=30, organisations=5, max_members=30, seed=3)
+        scatter(Organisation.objects.all())[0].users.add(*User.objects.all()[:2])
+        counts = (
+            User.objects.count(),
+            len(scatter(Organisation.objects.all())),
+            len(scatter(Membership.objects.all())),
+            Task.objects.count(),
+        )
+        call_command(
+            "benchmark_endpoints",
+            requests=3,
+            endpoints=["auth/register"],
+            stdout=StringIO(),
+        )
+        self.assertEqual(
+            (
+                User.objects.count(),
+                len(scatter(Organisation.objects.all())),
+                len(scatter(Membership.objects.all())),
+                Task.objects.count(),
+            ),
+            counts,
+        )
+
+    def test_benchmark_command_writes_results_and_gates(self):
+        generate_dataset(users=30, organisations=5, max_members=30, seed=2)
+        scatter(Organisation.objects.all())[0].users.add(*User.objects.all()[:2])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            call_command(
+                "benchmark_endpoints",
+                requests=3,
+                endpoints=["api/organisations", "api/users/<uuid>"],
+                output=path,
+                stdout=StringIO(),
+            )
+            with open(path) as fh:
+                results = json.load(fh)["results"]
+            self.assertEqual(len(results), 2)
+
+            for row in results:
+                row["max_queries"] = -1
+            with open(path, "w") as fh:
+                json.dump({"results": results}, fh)
+            with self.assertRaises(CommandError):
+                call_command(
+                    "benchmark_endpoints",
+                    requests=3,
+                    endpoints=["api/organisations"],
+                    baseline=path,
+                    stdout=StringIO(),
+                )
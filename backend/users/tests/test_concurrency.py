@@ -0,0 +1,148 @@
+import asyncio
+import threading
+
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.concurrency import (
+    AdaptiveLimiter,
+    get_limiters,
+    reset_limiters,
+    route_class,
+)
+from users.models import User
+
+
+def limiter(**kwargs):
+    options = dict(initial=2, min_limit=1, max_limit=4, target=0.1, queue_timeout=0)
+    options.update(kwargs)
+    return AdaptiveLimiter("test", **options)
+
+
+class AdaptiveLimiterTest(SimpleTestCase):
+    def test_sheds_once_the_limit_is_reached(self):
+        limit = limiter()
+        self.assertTrue(limit.acquire())
+        self.assertTrue(limit.acquire())
+        self.assertFalse(limit.acquire())
+        self.assertEqual((limit.in_flight, limit.shed), (2, 1))
+
+    def test_fast_responses_grow_and_slow_ones_shrink_the_limit(self):
+        limit = limiter()
+        for _ in range(20):
+            limit.acquire()
+            limit.acquire()
+            limit.release(0.01)
+            limit.release(0.01)
+        self.assertEqual(limit.limit, 4)
+
+        limit.acquire()
+        limit.release(1.0)
+        self.assertAlmostEqual(limit.limit, 3.6)
+        # One decrease per target interval, however many slow responses.
+        limit.acquire()
+        limit.release(1.0, failed=True)
+        self.assertAlmostEqual(limit.limit, 3.6)
+
+    def test_limit_never_drops_below_min(self):
+        limit = limiter(target=0)
+        for _ in range(50):
+            limit.acquire()
+            limit.release(1.0)
+        self.assertEqual(limit.limit, 1)
+
+    def test_queued_request_gets_a_released_slot(self):
+        limit = limiter(initial=1, queue_timeout=5)
+        limit.acquire()
+        timer = threading.Timer(0.05, limit.release, args=(0.01,))
+        timer.start()
+        self.assertTrue(limit.acquire())
+        timer.join()
+        self.assertEqual(limit.shed, 0)
+
+    def test_async_waiter_gets_a_released_slot(self):
+        limit = limiter(initial=1, max_limit=1, queue_timeout=5)
+        limit.acquire()
+        timer = threading.Timer(0.05, limit.release, args=(0.01,))
+        timer.start()
+        self.assertTrue(asyncio.run(limit.aacquire()))
+        timer.join()
+        self.assertEqual((limit.in_flight, limit.shed), (1, 0))
+
+        limit.queue_timeout = 0.01
+        self.assertFalse(asyncio.run(limit.aacquire()))
+        self.assertEqual(limit.shed, 1)
+
+    def test_route_classes(self):
+        self.assertEqual(route_class("login", "POST"), "auth")
+        self.assertEqual(route_class("user-detail", "GET"), "read")
+        self.assertEqual(route_class("organisation-list-create", "POST"), "write")
+        self.assertIsNone(route_class("metrics", "GET"))
+
+
+class ConcurrencyLimitMiddlewareTest(TestCase):
+    def setUp(self):
+        reset_limiters()
+        self.addCleanup(reset_limiters)
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            firstName="User",
+            lastName="One",
+            password="password123",
+        )
+
+    def test_saturated_auth_class_sheds_logins_but_not_reads(self):
+        auth = get_limiters()["auth"]
+        while auth.in_flight < int(auth.limit):
+            auth.acquire()
+        client = APIClient()
+        response = client.post(
+            reverse("login"),
+            {"email": "user@example.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(auth.shed, 1)
+
+        client.force_authenticate(user=self.user)
+        url = reverse("user-detail", args=[self.user.userId])
+        self.assertEqual(client.get(url).status_code, 200)
+        self.assertEqual(get_limiters()["read"].in_flight, 0)
+
+    @override_settings(CONCURRENCY_LIMITS={"ENABLED": False})
+    def test_disabled(self):
+        response = APIClient().post(
+            reverse("login"),
+            {"email": "user@example.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_streaming_response_holds_its_slot_until_closed(self):
+        admin = User.objects.create_superuser(
+            email="admin@example.com",
+            firstName="Admin",
+            lastName="User",
+            password="password123",
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        response = client.get(reverse("user-admin-export"))
+        read = get_limiters()["read"]
+        self.assertEqual(read.in_flight, 1)
+        b"".join(response.streaming_content)
+        self.assertEqual(read.in_flight, 0)
+
+    @override_settings(ROOT_URLCONF="users.async_urls")
+    async def test_async_requests_are_admitted_on_the_event_loop(self):
+        auth = get_limiters()["auth"]
+        while auth.in_flight < int(auth.limit):
+            auth.acquire()
+        response = await AsyncClient().post(
+            reverse("login"),
+            {"email": "user@example.com", "password": "password123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(auth.shed, 1)
@@ -0,0 +1,65 @@
+import sqlite3
+import threading
+from django.test import SimpleTestCase
+from backend.db.pool import ConnectionPool, PoolTimeout
+
+
+def connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def ping(conn):
+    conn.execute("SELECT 1")
+    return True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def test_reuses_released_connections(self):
+        pool = ConnectionPool(connect, max_size=2, ping=ping)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(pool.stats()["connects"], 1)
+        self.assertEqual(pool.stats()["in_use"], 1)
+
+    def test_replaces_connections_that_fail_pre_ping(self):
+        pool = ConnectionPool(connect, max_size=1, ping=ping)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, conn)
+        fresh.execute("SELECT 1")
+        self.assertEqual(pool.stats()["ping_failures"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_waits_for_a_connection_then_times_out(self):
+        pool = ConnectionPool(connect, max_size=1, timeout=0.05)
+        conn = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+        pool.timeout = 5
+        timer = threading.Timer(0.05, pool.release, args=[conn])
+        timer.start()
+        self.assertIs(pool.acquire(), conn)
+        timer.join()
+        self.assertEqual(pool.stats()["waits"], 1)
+        self.assertGreater(pool.stats()["wait_seconds"], 0)
+
+    def test_reaps_idle_connections_above_min_size(self):
+        pool = ConnectionPool(connect, min_size=1, max_size=3, idle_timeout=0)
+        conns = [pool.acquire() for _ in range(3)]
+        for conn in conns:
+            pool.release(conn)
+        pool.acquire()
+        stats = pool.stats()
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["idle"], 0)
+
+    def test_discard_frees_a_slot(self):
+        pool = ConnectionPool(connect, max_size=1, timeout=0.05)
+        pool.release(pool.acquire(), discard=True)
+        pool.acquire()
+        self.assertEqual(pool.stats()["connects"], 2)
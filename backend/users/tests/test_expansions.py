@@ -0,0 +1,136 @@
+import unittest
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from backend.db.routers import scatter
+from users.authentication import get_user_cache
+from users.membership import get_membership_index
+from users.models import User, Organisation
+
+
+class ExpansionTestMixin:
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        get_user_cache().clear()
+        get_membership_index().clear()
+        self.owner = self.make_user("owner")
+        self.members = [self.make_user(f"member{i}") for i in range(5)]
+        self.organisations = []
+        for i in range(3):
+            organisation = Organisation.objects.create(name=f"Org{i}")
+            organisation.users.add(self.owner, *self.members[: i + 2])
+            self.organisations.append(organisation)
+
+    def make_user(self, name):
+        return User.objects.create_user(
+            email=f"{name}@example.com",
+            firstName=name.title(),
+            lastName="User",
+            password="password123",
+        )
+
+
+class SparseFieldsetTest(ExpansionTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_organisation_list_fields(self):
+        response = self.client.get(
+            reverse("organisation-list-create"), {"fields": "orgId,bogus"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["data"]["organisations"][0],
+            {"orgId": str(self.organisations[0].orgId)},
+        )
+
+    def test_detail_fields(self):
+        url = reverse("organisation-detail", args=[self.organisations[0].orgId])
+        self.assertEqual(
+            self.client.get(url, {"fields": "name"}).data["data"], {"name": "Org0"}
+        )
+        url = reverse("user-detail", args=[self.members[0].userId])
+        self.assertEqual(
+            self.client.get(url, {"fields": "email,firstName"}).data["data"],
+            {"firstName": "Member0", "email": "member0@example.com"},
+        )
+
+    def test_fields_do_not_restrict_writes(self):
+        response = self.client.post(
+            reverse("organisation-list-create") + "?fields=orgId",
+            {"description": "kept"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(scatter(Organisation.objects.filter(description="kept")))
+
+
+class ExpandMembersTest(ExpansionTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def test_list_expands_members(self):
+        url = reverse("organisation-list-create")
+        response = self.client.get(url, {"expand": "members", "members_limit": 2})
+        organisations = response.data["data"]["organisations"]
+        self.assertEqual([org["memberCount"] for org in organisations], [3, 4, 5])
+        self.assertTrue(all(len(org["members"]) == 2 for org in organisations))
+        self.assertEqual(
+            organisations[0]["members"][0]["userId"], str(self.owner.userId)
+        )
+
+    @unittest.skipIf(settings.DATABASE_SHARDS, "counts queries on one database")
+    def test_list_expands_members_in_constant_queries(self):
+        url = reverse("organisation-list-create")
+        with self.assertNumQueries(3):
+            self.client.get(url, {"expand": "members", "members_limit": 2})
+        Organisation.objects.create(name="Org3").users.add(self.owner)
+        with self.assertNumQueries(3):
+            self.client.get(url, {"expand": "members"})
+
+    def test_detail_pages_members(self):
+        url = reverse("organisation-detail", args=[self.organisations[2].orgId])
+        response = self.client.get(
+            url, {"expand": "members", "members_limit": 2, "members_offset": 4}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        data = response.data["data"]
+        self.assertEqual(data["memberCount"], 5)
+        self.assertEqual(
+            [member["email"] for member in data["members"]], ["member3@example.com"]
+        )
+
+    def test_detail_expand_still_checks_membership(self):
+        outsider = self.make_user("outsider")
+        self.client.force_authenticate(user=outsider)
+        url = reverse("organisation-detail", args=[self.organisations[0].orgId])
+        self.assertEqual(self.client.get(url, {"expand": "members"}).status_code, 403)
+
+
+@override_settings(ROOT_URLCONF="users.async_urls")
+class AsyncExpandMembersTest(ExpansionTestMixin, TestCase):
+    def auth(self):
+        return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(self.owner)}"}
+
+    def test_async_list_and_detail(self):
+        response = self.client.get(
+            reverse("organisation-list-create"),
+            {"expand": "members", "fields": "name"},
+            **self.auth(),
+        )
+        organisations = response.json()["data"]["organisations"]
+        self.assertEqual(sorted(organisations[0]), ["memberCount", "members", "name"])
+        url = reverse("organisation-detail", args=[self.organisations[1].orgId])
+        data = self.client.get(url, {"expand": "members"}, **self.auth()).json()["data"]
+        self.assertEqual(data["memberCount"], 4)
+        self.assertEqual(len(data["members"]), 4)
@@ -0,0 +1,56 @@
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase
+from users.hashing import HashingExecutor, HashingUnavailable
+from users import hashing
+from users.backends import PooledModelBackend
+from users.models import User
+
+
+class HashingExecutorTest(TestCase):
+    def test_pool_hashes_out_of_process(self):
+        executor = HashingExecutor(workers=1, max_pending=4, timeout=30)
+        try:
+            encoded = executor.run(hashing.hashers.make_password, "password123")
+            self.assertTrue(check_password("password123", encoded))
+            self.assertTrue(
+                executor.run(hashing.hashers.check_password, "password123", encoded)
+            )
+        finally:
+            executor.shutdown()
+
+    def test_inline_mode(self):
+        executor = HashingExecutor(workers=0, max_pending=4, timeout=30)
+        encoded = executor.run(hashing.hashers.make_password, "password123")
+        self.assertTrue(check_password("password123", encoded))
+
+    def test_rejects_when_queue_is_full(self):
+        executor = HashingExecutor(workers=1, max_pending=0, timeout=30)
+        with self.assertRaises(HashingUnavailable):
+            executor.submit(hashing.hashers.make_password, "password123")
+
+
+class PooledModelBackendTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="pooled@example.com",
+            firstName="Pooled",
+            lastName="User",
+            password="password123",
+        )
+
+    def test_authenticates_valid_credentials(self):
+        backend = PooledModelBackend()
+        self.assertEqual(
+            backend.authenticate(
+                None, email="pooled@example.com", password="password123"
+            ),
+            self.user,
+        )
+        self.assertIsNone(
+            backend.authenticate(None, email="pooled@example.com", password="wrong")
+        )
+        self.assertIsNone(
+            backend.authenticate(
+                None, email="nobody@example.com", password="password123"
+            )
+        )
@@ -0,0 +1,17 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from users.management.commands.verify_indexes import sequential_scans
+
+
+class HotPathIndexTest(TestCase):
+    def test_hot_queries_are_index_backed(self):
+        out = StringIO()
+        call_command("verify_indexes", stdout=out)
+        self.assertIn("All hot queries are index-backed.", out.getvalue())
+
+    def test_detects_sequential_scans(self):
+        self.assertEqual(sequential_scans("2 0 0 SCAN users_user"), ["users_user"])
+        self.assertEqual(
+            sequential_scans("2 0 0 SCAN users_user USING COVERING INDEX idx"), []
+        )
@@ -0,0 +1,102 @@
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from users import throttling
+from users.models import User
+from users.throttling import (
+    CacheTokenBucketLimiter,
+    LoginThrottle,
+    TokenBucketLimiter,
+    get_login_limiters,
+)
+
+
+class TokenBucketLimiterTest(SimpleTestCase):
+    def test_refills_over_time(self):
+        limiter = TokenBucketLimiter(capacity=2, period=60, shards=4)
+        with mock.patch.object(throttling.time, "monotonic", return_value=100.0):
+            self.assertEqual(limiter.consume("k"), 0)
+            self.assertEqual(limiter.consume("k"), 0)
+            self.assertAlmostEqual(limiter.consume("k"), 30.0)
+            self.assertEqual(limiter.consume("other"), 0)
+        with mock.patch.object(throttling.time, "monotonic", return_value=131.0):
+            self.assertEqual(limiter.consume("k"), 0)
+
+    def test_zero_cost_only_checks(self):
+        limiter = TokenBucketLimiter(capacity=1, period=60, shards=1)
+        for _ in range(3):
+            self.assertEqual(limiter.consume("k", cost=0), 0)
+        self.assertEqual(limiter.consume("k"), 0)
+        self.assertGreater(limiter.consume("k", cost=0), 0)
+
+    def test_client_ip_ignores_forwarded_for_without_proxies(self):
+        request = APIRequestFactory().post(
+            "/", HTTP_X_FORWARDED_FOR="203.0.113.9", REMOTE_ADDR="198.51.100.1"
+        )
+        self.assertEqual(LoginThrottle().get_ident(request), "198.51.100.1")
+
+    def test_shards_are_bounded(self):
+        limiter = TokenBucketLimiter(capacity=1, period=60, shards=2, max_keys=4)
+        for i in range(100):
+            limiter.consume(f"key-{i}")
+        self.assertLessEqual(sum(len(b) for _, b in limiter._shards), 4)
+
+
+class CacheTokenBucketLimiterTest(SimpleTestCase):
+    def test_clear_resets_buckets_for_every_worker(self):
+        limiter = CacheTokenBucketLimiter(1, 60, "default", prefix="test-throttle")
+        other_worker = CacheTokenBucketLimiter(1, 60, "default", prefix="test-throttle")
+        unrelated = CacheTokenBucketLimiter(1, 60, "default", prefix="other-throttle")
+        self.addCleanup(limiter.clear)
+        self.addCleanup(unrelated.clear)
+        self.assertEqual(limiter.consume("k"), 0)
+        self.assertGreater(other_worker.consume("k"), 0)
+        self.assertEqual(unrelated.consume("k"), 0)
+        limiter.clear()
+        self.assertEqual(other_worker.consume("k"), 0)
+        self.assertGreater(unrelated.consume("k"), 0)
+
+
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        for limiter in get_login_limiters().values():
+            limiter.clear()
+        self.addCleanup(lambda: [l.clear() for l in get_login_limiters().values()])
+        self.client = APIClient()
+        User.objects.create_user(
+            email="throttled@example.com",
+            firstName="Throttled",
+            lastName="User",
+            password="password123",
+        )
+
+    def test_rejects_before_hashing_with_retry_after(self):
+        url = reverse("login")
+        credentials = {"email": "throttled@example.com", "password": "wrong"}
+        for _ in range(5):
+            self.assertEqual(self.client.post(url, credentials).status_code, 401)
+        with mock.patch("users.hashing.check_password") as check:
+            response = self.client.post(url, credentials)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        check.assert_not_called()
+
+        other = {"email": "someone-else@example.com", "password": "wrong"}
+        self.assertEqual(self.client.post(url, other).status_code, 401)
+
+    def test_successful_logins_do_not_lock_the_account(self):
+        url = reverse("login")
+        credentials = {"email": "throttled@example.com", "password": "password123"}
+        for _ in range(8):
+            self.assertEqual(self.client.post(url, credentials).status_code, 200)
+
+    @override_settings(ROOT_URLCONF="users.async_urls")
+    def test_async_login_is_throttled(self):
+        url = reverse("login")
+        credentials = {"email": "THROTTLED@example.com", "password": "wrong"}
+        for _ in range(5):
+            self.client.post(url, credentials, format="json")
+        response = self.client.post(url, credentials, format="json")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
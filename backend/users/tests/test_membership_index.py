@@ -0,0 +1,75 @@
+import unittest
+from django.conf import settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.membership import Membership, get_membership_index
+from users.models import User, Organisation
+from django.test import TestCase
+
+
+class MembershipIndexTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        self.index = get_membership_index()
+        self.index.clear()
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(
+            email="user1@example.com",
+            firstName="User",
+            lastName="One",
+            password="password123",
+        )
+        self.user2 = User.objects.create_user(
+            email="user2@example.com",
+            firstName="User",
+            lastName="Two",
+            password="password123",
+        )
+        self.organisation = Organisation.objects.create(name="Org1")
+        self.organisation.users.add(self.user1)
+
+    def test_second_check_is_served_from_memory(self):
+        self.organisation.users.add(self.user2)
+        self.assertTrue(self.index.share_organisation(self.user1.pk, self.user2.pk))
+        with self.assertNumQueries(0):
+            self.assertTrue(self.index.share_organisation(self.user1.pk, self.user2.pk))
+        self.assertEqual(self.index.stats()["hits"], 1)
+        self.assertEqual(self.index.stats()["misses"], 1)
+
+    def test_no_shared_organisation_is_rechecked(self):
+        self.assertFalse(self.index.share_organisation(self.user1.pk, self.user2.pk))
+        # Added by another worker: no signal reaches this process's index.
+        Membership.objects.using(self.organisation._state.db).create(
+            organisation_id=self.organisation.pk, user_id=self.user2.pk
+        )
+        self.assertTrue(self.index.share_organisation(self.user1.pk, self.user2.pk))
+        self.assertEqual(self.index.stats()["misses"], 2)
+
+    @unittest.skipIf(
+        settings.DATABASE_SHARDS, "user.organisations cannot be routed to a shard"
+    )
+    def test_membership_changes_are_applied_incrementally(self):
+        self.index.share_organisation(self.user1.pk, self.user2.pk)
+        self.organisation.users.add(self.user2)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.index.share_organisation(self.user1.pk, self.user2.pk))
+        self.user2.organisations.remove(self.organisation)
+        self.assertFalse(self.index.share_organisation(self.user1.pk, self.user2.pk))
+
+    def test_clear_and_delete_invalidate(self):
+        self.organisation.users.add(self.user2)
+        self.assertTrue(self.index.share_organisation(self.user1.pk, self.user2.pk))
+        self.organisation.users.clear()
+        self.assertFalse(self.index.share_organisation(self.user1.pk, self.user2.pk))
+        self.organisation.users.add(self.user1, self.user2)
+        self.organisation.delete()
+        self.assertFalse(self.index.share_organisation(self.user1.pk, self.user2.pk))
+
+    def test_user_detail_uses_index(self):
+        self.organisation.users.add(self.user2)
+        self.client.force_authenticate(user=self.user2)
+        url = reverse("user-detail", args=[self.user1.userId])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.organisation.users.remove(self.user2)
+        self.assertEqual(self.client.get(url).status_code, 403)
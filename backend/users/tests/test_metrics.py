@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from users.authentication import get_user_cache
+from users.metrics import registry
+from users.models import User, Organisation
+
+# Authentication plus the organisation page, which is read from every shard.
+LIST_QUERIES = 1 + len(settings.DATABASE_SHARDS or [None])
+
+
+@override_settings(METRICS_DEBUG_HEADER=True, METRICS_TOKEN=None)
+class MetricsTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        registry.clear()
+        get_user_cache().clear()
+        self.user = User.objects.create_user(
+            email="metrics@example.com",
+            firstName="Metrics",
+            lastName="User",
+            password="password123",
+        )
+        Organisation.objects.create(name="Org1").users.add(self.user)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_debug_header_reports_request_numbers(self):
+        response = self.client.get(reverse("organisation-list-create"))
+        self.assertEqual(response.status_code, 200)
+        header = dict(
+            part.split("=") for part in response["X-Request-Metrics"].split(";")
+        )
+        self.assertEqual(int(header["queries"]), LIST_QUERIES)
+        self.assertGreater(float(header["auth"][:-2]), 0)
+        self.assertGreater(float(header["serialize"][:-2]), 0)
+
+    def test_scrape_endpoint_exposes_prometheus_text(self):
+        self.client.get(reverse("organisation-list-create"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        labels = 'route="api/organisations",method="GET",status="200"'
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 1", body)
+        self.assertIn(
+            f'http_request_db_queries_bucket{{{labels},le="{LIST_QUERIES}"}} 1', body
+        )
+        self.assertIn("membership_index_hits_total", body)
+
+    @override_settings(METRICS_TOKEN=None, METRICS_ALLOWED_IPS=["10.0.0.5"])
+    def test_scrape_requires_allowed_address_without_token(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.5")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_scrape_token(self):
+        client = APIClient()
+        self.assertEqual(client.get(reverse("metrics")).status_code, 403)
+        response = client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-secret"
+        )
+        self.assertEqual(response.status_code, 200)
@@ -1,4 +1,5 @@
 import unittest
+from django.conf import settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 from users.models import User, Organisation
@@ -6,6 +7,8 @@ from django.test import TestCase
 
 
 class OrganisationAccessTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
     def setUp(self):
         self.client = APIClient()
         self.user1 = User.objects.create_user(
@@ -28,3 +31,20 @@ class OrganisationAccessTest(TestCase):
         url = reverse("organisation-detail", args=[self.organisation.orgId])
         response = self.client.get(url)
         self.assertEqual(response.status_code, 403)  # Expecting Forbidden
+
+    def test_member_gets_etag_and_conditional_304(self):
+        self.client.force_authenticate(user=self.user1)
+        url = reverse("organisation-detail", args=[self.organisation.orgId])
+        with self.assertNumQueries(1, using=self.organisation._state.db):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        self.organisation.description = "changed"
+        self.organisation.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from backend.db.routers import each_shard
+from users.models import User, Organisation
+from django.test import TestCase
+
+
+class OrganisationListTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="member@example.com",
+            firstName="Member",
+            lastName="One",
+            password="password123",
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com",
+            firstName="Other",
+            lastName="Two",
+            password="password123",
+        )
+        for i in range(5):
+            org = Organisation.objects.create(name=f"Org{i}")
+            org.users.add(self.user)
+        Organisation.objects.create(name="Hidden").users.add(self.other)
+        self.url = reverse("organisation-list-create")
+
+    def test_list_is_scoped_to_memberships(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        names = [o["name"] for o in response.data["data"]["organisations"]]
+        self.assertEqual(names, [f"Org{i}" for i in range(5)])
+        self.assertIsNone(response.data["data"]["next"])
+
+    def test_list_follows_next_cursor(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"limit": 2})
+        names = [o["name"] for o in response.data["data"]["organisations"]]
+        while response.data["data"]["next"]:
+            response = self.client.get(response.data["data"]["next"])
+            self.assertLessEqual(len(response.data["data"]["organisations"]), 2)
+            names += [o["name"] for o in response.data["data"]["organisations"]]
+        self.assertEqual(names, [f"Org{i}" for i in range(5)])
+
+    def test_organisations_created_together_page_by_org_id(self):
+        moment = timezone.now()
+        for organisations in each_shard(Organisation.objects.all()):
+            organisations.update(created_at=moment)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"limit": 2})
+        org_ids = [o["orgId"] for o in response.data["data"]["organisations"]]
+        while response.data["data"]["next"]:
+            response = self.client.get(response.data["data"]["next"])
+            org_ids += [o["orgId"] for o in response.data["data"]["organisations"]]
+        self.assertEqual(len(org_ids), 5)
+        self.assertEqual(org_ids, sorted(org_ids))
@@ -0,0 +1,85 @@
+import unittest
+import uuid
+from django.conf import settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.membership import get_membership_index, member_ids
+from users.models import User, Organisation
+from django.test import TestCase
+
+
+class AddUsersToOrganisationTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        get_membership_index().clear()
+        self.client = APIClient()
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            firstName="Owner",
+            lastName="User",
+            password="password123",
+        )
+        self.members = [
+            User.objects.create_user(
+                email=f"member{i}@example.com",
+                firstName="Member",
+                lastName=str(i),
+                password="password123",
+            )
+            for i in range(3)
+        ]
+        self.organisation = Organisation.objects.create(name="Org1")
+        self.organisation.users.add(self.owner, self.members[0])
+        self.client.force_authenticate(user=self.owner)
+
+    def test_add_single_user(self):
+        url = reverse("add-user-to-organisation", args=[self.organisation.orgId])
+        response = self.client.post(
+            url, {"userId": str(self.members[1].userId)}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.members[1].pk, member_ids(self.organisation))
+
+    def test_add_unknown_single_user(self):
+        url = reverse("add-user-to-organisation", args=[self.organisation.orgId])
+        response = self.client.post(url, {"userId": str(uuid.uuid4())}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("userId", response.data["errors"])
+
+    def test_bulk_add_reports_per_id_results(self):
+        url = reverse("bulk-add-users-to-organisation", args=[self.organisation.orgId])
+        missing = uuid.uuid4()
+        user_ids = [str(m.userId) for m in self.members] + [str(missing)]
+        response = self.client.post(url, {"userIds": user_ids}, format="json")
+        self.assertEqual(response.status_code, 200)
+        results = response.data["data"]["results"]
+        self.assertEqual(results[str(self.members[0].userId)], "already_member")
+        self.assertEqual(results[str(self.members[1].userId)], "added")
+        self.assertEqual(results[str(self.members[2].userId)], "added")
+        self.assertEqual(results[str(missing)], "not_found")
+        self.assertEqual(member_ids(self.organisation).count(), 4)
+
+    @unittest.skipIf(settings.DATABASE_SHARDS, "counts queries on one database")
+    def test_bulk_add_query_count(self):
+        url = reverse("bulk-add-users-to-organisation", args=[self.organisation.orgId])
+        user_ids = [str(m.userId) for m in self.members] + [str(uuid.uuid4())]
+        # Lookups, existing members, then one membership insert and one queued
+        # task in a transaction (a savepoint and its release under TestCase).
+        with self.assertNumQueries(7):
+            self.client.post(url, {"userIds": user_ids}, format="json")
+
+    def test_bulk_add_requires_membership(self):
+        outsider = self.members[2]
+        self.client.force_authenticate(user=outsider)
+        url = reverse("bulk-add-users-to-organisation", args=[self.organisation.orgId])
+        response = self.client.post(
+            url, {"userIds": [str(outsider.userId)]}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn(outsider.pk, member_ids(self.organisation))
+
+    def test_bulk_add_requires_ids(self):
+        url = reverse("bulk-add-users-to-organisation", args=[self.organisation.orgId])
+        response = self.client.post(url, {"userIds": []}, format="json")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,59 @@
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.models import User, Organisation
+from users.projections import ORGANISATION_PROJECTION, USER_PROJECTION
+from users.serializers import UserSerializer, OrganisationSerializer
+
+
+class ProjectionTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com",
+            firstName="Admin",
+            lastName="User",
+            password="password123",
+        )
+        User.objects.create_user(
+            email="plain@example.com",
+            firstName="Plain",
+            lastName="User",
+            password="password123",
+            phone="555",
+        )
+        self.organisation = Organisation.objects.create(
+            name="Org1", description="first"
+        )
+
+    def test_projection_matches_model_serializers(self):
+        users = User.objects.order_by("id")
+        self.assertEqual(
+            USER_PROJECTION.render(USER_PROJECTION.queryset(users)),
+            UserSerializer(users, many=True).data,
+        )
+        organisations = Organisation.objects.using(self.organisation._state.db)
+        self.assertEqual(
+            ORGANISATION_PROJECTION.render(
+                ORGANISATION_PROJECTION.queryset(organisations)
+            ),
+            OrganisationSerializer(organisations, many=True).data,
+        )
+
+    def test_admin_list_skips_password_column(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        with self.assertNumQueries(1) as ctx:
+            response = client.get(reverse("user-admin-list"))
+        self.assertEqual(len(response.data), 2)
+        self.assertNotIn("password", ctx.captured_queries[0]["sql"])
+
+    def test_benchmark_command_rolls_back(self):
+        out = StringIO()
+        call_command("benchmark_projections", rows=20, stdout=out)
+        self.assertIn("users speedup", out.getvalue())
+        self.assertEqual(User.objects.count(), 2)
@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from backend.db.routers import scatter
+from users.membership import get_membership_index
+from users.models import User, Organisation
+from users.serializers import register_users
+
+
+def entry(i):
+    return {
+        "firstName": f"First{i}",
+        "lastName": "User",
+        "email": f"user{i}@example.com",
+        "password": "password123",
+    }
+
+
+class RegistrationPipelineTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        get_membership_index().clear()
+
+    def test_register_users_creates_default_organisations(self):
+        users = register_users([entry(i) for i in range(5)])
+        for user in users:
+            self.assertTrue(user.check_password("password123"))
+            self.assertTrue(
+                scatter(
+                    Organisation.objects.filter(
+                        name=f"{user.firstName}'s Organisation", users=user
+                    )
+                )
+            )
+
+    @unittest.skipIf(settings.DATABASE_SHARDS, "counts queries on one database")
+    def test_register_users_inserts_in_four_statements(self):
+        with CaptureQueriesContext(connection) as ctx:
+            register_users([entry(i) for i in range(5)])
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        # Users, organisations, memberships and the queued side-effect tasks.
+        self.assertEqual(len(inserts), 4)
+
+    def test_failure_leaves_no_partial_state(self):
+        with mock.patch(
+            "users.serializers._create_default_organisations",
+            side_effect=RuntimeError,
+        ):
+            with self.assertRaises(RuntimeError):
+                register_users([entry(1)])
+        self.assertFalse(User.objects.exists())
+
+    def test_register_endpoint_creates_default_organisation(self):
+        response = APIClient().post(reverse("register"), entry(1), format="json")
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(email="user1@example.com")
+        self.assertEqual(
+            list(get_membership_index().org_ids(user.pk)),
+            [
+                organisation.pk
+                for organisation in scatter(
+                    Organisation.objects.filter(name="First1's Organisation")
+                )
+            ],
+        )
+
+
+class BulkRegistrationTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com",
+            firstName="Admin",
+            lastName="User",
+            password="password123",
+        )
+        self.url = reverse("register-bulk")
+
+    def test_requires_admin(self):
+        user = User.objects.create_user(
+            email="plain@example.com",
+            firstName="Plain",
+            lastName="User",
+            password="password123",
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.post(self.url, {"users": [entry(1)]}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_register(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(
+            self.url, {"users": [entry(i) for i in range(3)]}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["data"]["users"]), 3)
+        # Users are on default, so filter memberships by id on the shards.
+        user_ids = User.objects.filter(email__startswith="user").values_list(
+            "pk", flat=True
+        )
+        self.assertEqual(
+            len(scatter(Organisation.objects.filter(users__in=list(user_ids)))), 3
+        )
+
+    def test_rejects_taken_and_duplicate_emails(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(
+            self.url, {"users": [entry(1), entry(1)]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        taken = dict(entry(2), email="admin@example.com")
+        response = self.client.post(self.url, {"users": [taken]}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(User.objects.count(), 1)
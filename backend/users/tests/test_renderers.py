@@ -0,0 +1,73 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from users import renderers
+from users.renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    payload = {
+        "status": "success",
+        "message": "Organisations retrieved successfully",
+        "data": {
+            "organisations": [
+                {
+                    "orgId": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                    "name": "Zoë's Organisation \u2028\u2029",
+                    "description": "",
+                    "updated_at": datetime.datetime(
+                        2024, 7, 8, 7, 2, 3, 123456, tzinfo=datetime.timezone.utc
+                    ),
+                    "balance": Decimal("1.50"),
+                }
+            ],
+            "next": None,
+            "errors": [ErrorDetail("bad", code="invalid")],
+            "big": 2**70,
+        },
+    }
+
+    def test_output_matches_drf_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload),
+            JSONRenderer().render(self.payload),
+        )
+
+    def test_documented_float_differences(self):
+        self.assertEqual(FastJSONRenderer().render({"n": 1e16}), b'{"n":1e16}')
+        self.assertEqual(JSONRenderer().render({"n": 1e16}), b'{"n":1e+16}')
+        self.assertEqual(FastJSONRenderer().render({"n": float("nan")}), b'{"n":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"n": float("nan")})
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(self.payload),
+                JSONRenderer().render(self.payload),
+            )
+
+    def test_indent_uses_stdlib(self):
+        self.assertEqual(
+            FastJSONRenderer().render({"a": 1}, "application/json; indent=2", {}),
+            JSONRenderer().render({"a": 1}, "application/json; indent=2", {}),
+        )
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def test_parses_like_drf(self):
+        body = '{"email": "zoë@example.com", "ids": [1, 2]}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_rejects_invalid_json(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b"{nope"))
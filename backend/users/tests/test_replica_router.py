@@ -0,0 +1,108 @@
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from backend.db.routers import (
+    ReplicaPinningMiddleware,
+    ReplicaRouter,
+    is_pinned,
+    is_sticky,
+    reset_pin,
+    stick_user,
+)
+from users.authentication import CachedJWTAuthentication, get_user_cache
+from users.models import User
+
+REPLICAS = ["replica_0", "replica_1"]
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        reset_pin()
+        self.addCleanup(reset_pin)
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_replicas_and_writes_to_primary(self):
+        self.assertIn(self.router.db_for_read(User), REPLICAS)
+        self.assertEqual(self.router.db_for_write(User), "default")
+
+    def test_reads_after_a_write_stay_on_primary(self):
+        self.router.db_for_write(User)
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica_0", "users"))
+        self.assertIsNone(self.router.allow_migrate("default", "users"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_inactive_without_replicas(self):
+        self.assertIsNone(self.router.db_for_read(User))
+        self.assertIsNone(self.router.db_for_write(User))
+        self.assertFalse(is_pinned())
+
+    def test_middleware_sticks_authenticated_writers(self):
+        user = User(pk=42)
+
+        def view(request):
+            request.user = user
+            self.router.db_for_write(User)
+            return HttpResponse()
+
+        request = RequestFactory().post("/")
+        ReplicaPinningMiddleware(view)(request)
+        self.assertFalse(is_pinned())
+        self.assertTrue(is_sticky(42))
+
+    async def test_async_middleware_sees_pin_from_sync_to_async(self):
+        user = User(pk=43)
+
+        async def view(request):
+            request.user = user
+            await sync_to_async(self.router.db_for_write)(User)
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(RequestFactory().post("/"))
+        self.assertFalse(is_pinned())
+        self.assertTrue(await sync_to_async(is_sticky)(43))
+
+
+class ReplicaStickinessTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(reset_pin)
+        self.addCleanup(get_user_cache().clear)
+
+    def test_registration_sticks_new_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = APIClient().post(
+                reverse("register"),
+                {
+                    "firstName": "Sticky",
+                    "lastName": "User",
+                    "email": "sticky@example.com",
+                    "password": "password123",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(email="sticky@example.com")
+        self.assertTrue(is_sticky(user.pk))
+
+    @override_settings(DATABASE_REPLICAS=REPLICAS)
+    def test_sticky_user_token_pins_reads(self):
+        stick_user(7)
+        get_user_cache().set(7, User(pk=7, email="seven@example.com"))
+        token = AccessToken()
+        token["user_id"] = 7
+        CachedJWTAuthentication().get_user(token)
+        self.assertTrue(is_pinned())
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.membership import Membership, get_membership_index
+from users.models import User, Organisation
+from django.test import TestCase
+
+
+class RepresentationCacheTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        get_membership_index().clear()
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(
+            email="user1@example.com",
+            firstName="User",
+            lastName="One",
+            password="password123",
+        )
+        self.user2 = User.objects.create_user(
+            email="user2@example.com",
+            firstName="User",
+            lastName="Two",
+            password="password123",
+        )
+        self.organisation = Organisation.objects.create(name="Org1")
+        self.organisation.users.add(self.user1, self.user2)
+        self.client.force_authenticate(user=self.user1)
+
+    def test_user_detail_served_from_cache(self):
+        url = reverse("user-detail", args=[self.user2.userId])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data["data"]["email"], "user2@example.com")
+
+        self.user2.lastName = "Renamed"
+        self.user2.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["data"]["lastName"], "Renamed")
+
+    def test_organisation_detail_served_from_cache(self):
+        url = reverse("organisation-detail", args=[self.organisation.orgId])
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        # Only the membership check runs; the body and ETag come from cache.
+        with self.assertNumQueries(1, using=self.organisation._state.db):
+            response = self.client.get(url)
+        self.assertEqual(response.data, first.data)
+        self.assertEqual(response["ETag"], first["ETag"])
+
+        self.organisation.description = "changed"
+        self.organisation.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data["data"]["description"], "changed")
+
+    def test_cached_organisation_still_checks_membership(self):
+        url = reverse("organisation-detail", args=[self.organisation.orgId])
+        self.client.get(url)
+        self.organisation.users.remove(self.user1)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_membership_written_elsewhere_is_seen_on_cache_hits(self):
+        url = reverse("organisation-detail", args=[self.organisation.orgId])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        outsider = User.objects.create_user(
+            email="user3@example.com",
+            firstName="User",
+            lastName="Three",
+            password="password123",
+        )
+        # Rows written without signals, as another worker's writes look here.
+        memberships = Membership.objects.using(self.organisation._state.db)
+        memberships.filter(user_id=self.user1.pk).delete()
+        memberships.create(organisation_id=self.organisation.pk, user_id=outsider.pk)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.membership import get_membership_index
+from users.models import User, Organisation
+from users.search import get_ngram_index
+
+
+class SearchTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        get_membership_index().clear()
+        for model in (User, Organisation):
+            get_ngram_index(model).clear()
+        self.client = APIClient()
+        self.alice = self.make_user("alice@example.com", "Alice", "Anderson")
+        self.bob = self.make_user("bob@example.com", "Bob", "Malice")
+        self.carol = self.make_user("carol@example.com", "Carol", "Alicea")
+        self.shared = Organisation.objects.create(name="Alice Analytics")
+        self.shared.users.add(self.alice, self.bob)
+        self.private = Organisation.objects.create(name="Carol's Palace")
+        self.private.users.add(self.carol)
+        self.url = reverse("search")
+
+    def make_user(self, email, first, last):
+        return User.objects.create_user(
+            email=email, firstName=first, lastName=last, password="password123"
+        )
+
+    def search(self, user, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get(self.url, params)
+
+    def emails(self, response):
+        return [row["email"] for row in response.data["data"]["users"]]
+
+    def test_results_are_scoped_to_co_members(self):
+        response = self.search(self.alice, q="lic")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.emails(response), ["alice@example.com", "bob@example.com"]
+        )
+        self.assertEqual(
+            [org["name"] for org in response.data["data"]["organisations"]],
+            ["Alice Analytics"],
+        )
+
+    def test_staff_see_everything_with_prefix_matches_first(self):
+        admin = User.objects.create_superuser(
+            email="root@example.com",
+            firstName="Root",
+            lastName="Admin",
+            password="password123",
+        )
+        response = self.search(admin, q="ALIC", type="users")
+        self.assertEqual(
+            self.emails(response),
+            ["alice@example.com", "carol@example.com", "bob@example.com"],
+        )
+        self.assertNotIn("organisations", response.data["data"])
+        response = self.search(admin, q="alic", type="users", limit=1)
+        self.assertEqual(self.emails(response), ["alice@example.com"])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.assertEqual(
+            self.emails(self.search(self.alice, q="bob")), ["bob@example.com"]
+        )
+        self.bob.firstName = "Robert"
+        self.bob.email = "robert@example.com"
+        self.bob.save()
+        self.assertEqual(self.emails(self.search(self.alice, q="bob")), [])
+        self.assertEqual(
+            self.emails(self.search(self.alice, q="robert")), ["robert@example.com"]
+        )
+        self.bob.delete()
+        self.assertEqual(self.emails(self.search(self.alice, q="robert")), [])
+
+    @override_settings(SEARCH={"BACKEND": "database"})
+    def test_database_backend_matches_ngram_backend(self):
+        response = self.search(self.alice, q="lic")
+        self.assertEqual(
+            self.emails(response), ["alice@example.com", "bob@example.com"]
+        )
+        response = self.search(self.carol, q="pala", type="organisations")
+        self.assertEqual(
+            [org["name"] for org in response.data["data"]["organisations"]],
+            ["Carol's Palace"],
+        )
+
+    def test_rejects_short_queries_and_unknown_types(self):
+        response = self.search(self.alice, q="al")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("q", response.data["errors"])
+        response = self.search(self.alice, q="alice", type="teams")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("type", response.data["errors"])
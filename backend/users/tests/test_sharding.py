@@ -0,0 +1,206 @@
+import unittest
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections, router
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from backend.db.routers import jump_hash, shard_for, shard_pk
+from users.membership import Membership, get_membership_index
+from users.models import User, Organisation
+
+SHARDS = ["shard_0", "shard_1", "shard_2"]
+
+
+class ShardHashTest(SimpleTestCase):
+    def test_jump_hash_is_balanced_and_moves_few_keys(self):
+        keys = [uuid.uuid4().int >> 64 for _ in range(5000)]
+        before = [jump_hash(key, 4) for key in keys]
+        self.assertTrue(all(900 < n < 1600 for n in Counter(before).values()))
+        after = [jump_hash(key, 5) for key in keys]
+        moved = [new for old, new in zip(before, after) if old != new]
+        # Only keys bound for the new bucket move: about a fifth of them.
+        self.assertEqual(set(moved), {4})
+        self.assertLess(len(moved), 1300)
+
+    @override_settings(DATABASE_SHARDS=SHARDS)
+    def test_shard_for_is_stable(self):
+        org_id = uuid.uuid4()
+        self.assertIn(shard_for(org_id), SHARDS)
+        self.assertEqual(shard_for(org_id), shard_for(str(org_id)))
+        self.assertIsNone(shard_for("not-a-uuid"))
+        self.assertGreater(shard_pk(org_id), 0)
+        self.assertLess(shard_pk(org_id), 2**63)
+
+    @override_settings(DATABASE_SHARDS=[])
+    def test_unsharded_routing_is_unchanged(self):
+        self.assertIsNone(shard_for(uuid.uuid4()))
+        organisation = Organisation(name="Org")
+        self.assertEqual(
+            router.db_for_write(Organisation, instance=organisation), "default"
+        )
+
+
+@override_settings(DATABASE_SHARDS=SHARDS)
+class ShardRouterTest(SimpleTestCase):
+    def test_organisations_and_memberships_follow_org_id(self):
+        organisation = Organisation(name="Org")
+        alias = shard_for(organisation.orgId)
+        self.assertEqual(
+            router.db_for_write(Organisation, instance=organisation), alias
+        )
+        self.assertEqual(router.db_for_write(Membership, instance=organisation), alias)
+        organisation._state.db = "shard_2"
+        self.assertEqual(
+            router.db_for_read(Organisation, instance=organisation), "shard_2"
+        )
+
+    def test_users_stay_global(self):
+        user = User(email="user@example.com")
+        self.assertEqual(router.db_for_write(User, instance=user), "default")
+        self.assertTrue(router.allow_relation(user, Organisation(name="Org")))
+
+
+@unittest.skipUnless(
+    len(settings.DATABASE_SHARDS) >= 2,
+    "set DATABASE_SHARD_URLS to two or more databases",
+)
+class ShardedOrganisationTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        get_membership_index().clear()
+        self.client = APIClient()
+
+    def register(self, name):
+        response = self.client.post(
+            reverse("register"),
+            {
+                "firstName": name.title(),
+                "lastName": "User",
+                "email": f"{name}@example.com",
+                "password": "password123",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return User.objects.get(email=f"{name}@example.com")
+
+    def organisation_of(self, user):
+        for alias in settings.DATABASE_SHARDS:
+            organisation = (
+                Organisation.objects.using(alias).filter(users=user.pk).first()
+            )
+            if organisation is not None:
+                return organisation
+
+    def test_only_shards_drop_the_membership_user_constraint(self):
+        def user_constraints(alias):
+            connection = connections[alias]
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(
+                    cursor, Membership._meta.db_table
+                )
+            return {
+                name: c
+                for name, c in constraints.items()
+                if c["columns"] == ["user_id"]
+            }
+
+        self.assertTrue(
+            any(c["foreign_key"] for c in user_constraints("default").values())
+        )
+        for alias in settings.DATABASE_SHARDS:
+            constraints = user_constraints(alias)
+            self.assertFalse(any(c["foreign_key"] for c in constraints.values()))
+
+    def test_registration_places_organisation_on_its_shard(self):
+        user = self.register("alice")
+        organisation = self.organisation_of(user)
+        self.assertEqual(organisation._state.db, shard_for(organisation.orgId))
+        self.assertEqual(organisation.pk, shard_pk(organisation.orgId))
+        self.assertFalse(Organisation.objects.using("default").exists())
+
+        self.client.force_authenticate(user=user)
+        url = reverse("organisation-detail", args=[organisation.orgId])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["orgId"], str(organisation.orgId))
+
+    def test_add_user_writes_membership_to_the_shard(self):
+        owner, member = self.register("owner"), self.register("member")
+        organisation = self.organisation_of(owner)
+        self.client.force_authenticate(user=owner)
+        response = self.client.post(
+            reverse("add-user-to-organisation", args=[organisation.orgId]),
+            {"userId": str(member.userId)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            Membership.objects.using(organisation._state.db)
+            .filter(organisation_id=organisation.pk, user_id=member.pk)
+            .exists()
+        )
+        get_membership_index().clear()
+        self.assertIn(organisation.pk, get_membership_index().org_ids(member.pk))
+
+        self.client.force_authenticate(user=member)
+        url = reverse("organisation-detail", args=[organisation.orgId])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_rebalance_moves_misplaced_organisations(self):
+        user = self.register("carol")
+        organisation = self.organisation_of(user)
+        home = organisation._state.db
+        elsewhere = next(a for a in settings.DATABASE_SHARDS if a != home)
+        stray = Organisation(name="Stray")
+        while shard_for(stray.orgId) != home:
+            stray.orgId = uuid.uuid4()
+        stray.save(using=elsewhere)
+        stray.users.add(user)
+
+        call_command("rebalance_shards", stdout=None)
+        self.assertFalse(Organisation.objects.using(elsewhere).exists())
+        moved = Organisation.objects.using(home).get(orgId=stray.orgId)
+        self.assertEqual(moved.pk, stray.pk)
+        self.assertEqual(
+            list(
+                Membership.objects.using(home)
+                .filter(organisation_id=moved.pk)
+                .values_list("user_id", flat=True)
+            ),
+            [user.pk],
+        )
+
+    def test_rebalance_moves_organisations_off_default(self):
+        user = self.register("dave")
+        # Created before sharding was switched on: a sequence pk on default.
+        legacy = Organisation(pk=7, name="Legacy")
+        legacy.save(using="default")
+        Membership.objects.using("default").create(
+            organisation_id=legacy.pk, user_id=user.pk
+        )
+
+        call_command("rebalance_shards", stdout=None)
+        self.assertFalse(Organisation.objects.using("default").exists())
+        self.assertFalse(Membership.objects.using("default").exists())
+        home = shard_for(legacy.orgId)
+        self.assertEqual(Organisation.objects.using(home).get(orgId=legacy.orgId).pk, 7)
+        self.assertEqual(
+            list(
+                Membership.objects.using(home)
+                .filter(organisation_id=7)
+                .values_list("user_id", flat=True)
+            ),
+            [user.pk],
+        )
+
+        self.client.force_authenticate(user=user)
+        url = reverse("organisation-detail", args=[legacy.orgId])
+        self.assertEqual(self.client.get(url).status_code, 200)
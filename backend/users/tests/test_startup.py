@@ -0,0 +1,30 @@
+from django.test import SimpleTestCase
+from users.management.commands.profile_startup import (
+    group_by_package,
+    parse_import_times,
+    profile,
+)
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     django.utils.version
+import time:        80 |        200 |   django.utils
+import time:       300 |        500 | django
+import time:        40 |         40 | rest_framework
+"""
+
+
+class StartupProfileTest(SimpleTestCase):
+    def test_parse_import_times(self):
+        modules = parse_import_times(SAMPLE)
+        self.assertEqual(modules["django.utils"], (80, 200))
+        self.assertEqual(
+            group_by_package(modules), {"django": 500, "rest_framework": 40}
+        )
+
+    def test_api_only_drops_admin_and_sessions(self):
+        full = profile(api_only=False)
+        slim = profile(api_only=True)
+        self.assertIn("django.contrib.admin", full["apps"])
+        self.assertNotIn("django.contrib.admin", slim["apps"])
+        self.assertNotIn("django.contrib.sessions", slim["apps"])
+        self.assertIn("users", slim["apps"])
@@ -0,0 +1,162 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from backend.db.routers import scatter
+from users import queue
+from users.membership import get_membership_index
+from users.models import User, Organisation, Task
+from users.representations import get_organisation_entry
+from users.serializers import register_users
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.addCleanup(queue._handlers.pop, "test.batch", None)
+        self.addCleanup(queue._handlers.pop, "test.flaky", None)
+
+        @queue.task("test.batch", batch=True)
+        def batch(payloads):
+            self.calls.append(payloads)
+
+        @queue.task("test.flaky", max_attempts=2)
+        def flaky(payload):
+            raise RuntimeError(payload["reason"])
+
+    def test_batch_handlers_get_all_payloads_at_once(self):
+        queue.enqueue_many([("test.batch", {"n": i}) for i in range(3)])
+        self.assertEqual(queue.run_pending(), 3)
+        self.assertEqual(self.calls, [[{"n": 0}, {"n": 1}, {"n": 2}]])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failures_back_off_then_fail(self):
+        task = queue.enqueue("test.flaky", {"reason": "boom"})
+        self.assertEqual(queue.run_pending(), 0)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task.QUEUED, 1))
+        self.assertIn("boom", task.last_error)
+        self.assertGreater(task.run_at, timezone.now())
+
+        # Not due yet: nothing is claimed until the backoff elapses.
+        self.assertEqual(queue.claim(10, 60), [])
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs("users.queue", "ERROR"):
+            queue.run_pending()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task.FAILED, 2))
+
+    def test_expired_leases_are_reclaimed(self):
+        queue.enqueue("test.batch", {"n": 1})
+        self.assertEqual(len(queue.claim(10, 60)), 1)
+        self.assertEqual(queue.claim(10, 60), [])
+        Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(queue.run_pending(), 1)
+
+    def test_unknown_tasks_are_requeued_for_a_newer_worker(self):
+        task = queue.enqueue("test.missing")
+        with self.assertLogs("users.queue", "WARNING"):
+            self.assertEqual(queue.run_pending(), 0)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task.QUEUED, 0))
+        self.assertGreater(task.run_at, timezone.now())
+
+        self.addCleanup(queue._handlers.pop, "test.missing", None)
+        queue.task("test.missing")(lambda payload: None)
+        Task.objects.update(run_at=timezone.now())
+        self.assertEqual(queue.run_pending(), 1)
+
+    def test_worker_sleeps_instead_of_spinning_on_leased_tasks(self):
+        queue.enqueue("test.batch", {"n": 1})
+        with mock.patch(
+            "users.management.commands.run_tasks.run_pending", return_value=0
+        ), mock.patch("users.management.commands.run_tasks.time.sleep") as sleep:
+            sleep.side_effect = lambda seconds: Task.objects.all().delete()
+            call_command("run_tasks", once=True, interval=0.5, stdout=None)
+        sleep.assert_called_once_with(0.5)
+
+
+class RegistrationTasksTest(TestCase):
+    databases = {"default", *settings.DATABASE_SHARDS}
+
+    def setUp(self):
+        cache.clear()
+        get_membership_index().clear()
+
+    def test_registration_queues_side_effects_for_the_worker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = APIClient().post(
+                reverse("register"),
+                {
+                    "firstName": "Ada",
+                    "lastName": "Lovelace",
+                    "email": "ada@example.com",
+                    "password": "password123",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            sorted(Task.objects.values_list("name", flat=True)),
+            ["users.send_welcome_email", "users.warm_representations"],
+        )
+
+        [organisation] = scatter(Organisation.objects.all())
+        call_command("run_tasks", once=True, stdout=None)
+        self.assertEqual([message.to for message in mail.outbox], [["ada@example.com"]])
+        self.assertIsNotNone(get_organisation_entry(organisation.orgId))
+        self.assertFalse(Task.objects.exists())
+
+    def test_welcome_emails_share_one_connection(self):
+        register_users(
+            [
+                {
+                    "firstName": f"User{i}",
+                    "lastName": "Test",
+                    "email": f"user{i}@example.com",
+                    "password": "password123",
+                }
+                for i in range(3)
+            ]
+        )
+        with mock.patch("users.tasks.get_connection") as get_connection:
+            queue.run_pending()
+        get_connection.assert_called_once()
+        connection = get_connection.return_value.__enter__.return_value
+        messages = connection.send_messages.call_args.args[0]
+        self.assertEqual(len(messages), 3)
+
+    def test_added_member_is_notified_once(self):
+        owner, member = (
+            User.objects.create_user(
+                email=f"{name}@example.com",
+                firstName=name.title(),
+                lastName="User",
+                password="password123",
+            )
+            for name in ("owner", "member")
+        )
+        organisation = Organisation.objects.create(name="Org")
+        organisation.users.add(owner)
+        client = APIClient()
+        client.force_authenticate(user=owner)
+        url = reverse("add-user-to-organisation", args=[organisation.orgId])
+        for _ in range(2):
+            client.post(url, {"userId": str(member.userId)}, format="json")
+        task = Task.objects.get()
+        self.assertEqual(
+            task.payload,
+            {"organisation": str(organisation.orgId), "users": [member.pk]},
+        )
+        queue.run_pending()
+        self.assertEqual(
+            [message.to for message in mail.outbox], [["member@example.com"]]
+        )
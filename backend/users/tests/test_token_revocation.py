@@ -0,0 +1,120 @@
+import threading
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from users.authentication import get_user_cache
+from users.models import User, RevokedToken
+from users.revocation import BloomFilter, RevocationList, get_revocation_list
+
+
+class BloomFilterTest(TestCase):
+    def test_members_and_false_positive_rate(self):
+        bloom = BloomFilter(1000, 0.001)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 50)
+
+
+class RevocationListTest(TestCase):
+    def setUp(self):
+        self.revocations = RevocationList(
+            rebuild_interval=3600,
+            capacity=1000,
+            error_rate=0.001,
+            confirm_cache_size=100,
+        )
+
+    def test_unrevoked_tokens_skip_the_store(self):
+        self.revocations.rebuild()
+        with self.assertNumQueries(0):
+            self.assertFalse(self.revocations.is_revoked("unknown"))
+
+    def test_rebuild_picks_up_revocations_from_other_processes(self):
+        self.revocations.rebuild()
+        RevokedToken.objects.create(
+            jti="elsewhere", expires_at=timezone.now() + timedelta(hours=1)
+        )
+        self.assertFalse(self.revocations.is_revoked("elsewhere"))
+        self.revocations.rebuild()
+        self.assertTrue(self.revocations.is_revoked("elsewhere"))
+
+    def test_expired_revocations_are_ignored_and_purged(self):
+        RevokedToken.objects.create(
+            jti="old", expires_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertFalse(self.revocations.is_revoked("old"))
+        call_command("revoke_tokens", "new", purge_expired=True, stdout=None)
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["new"]
+        )
+
+
+class BackgroundRebuildTest(TransactionTestCase):
+    def test_stale_filter_is_rebuilt_off_the_request_thread(self):
+        revocations = RevocationList(
+            rebuild_interval=3600,
+            capacity=1000,
+            error_rate=0.001,
+            confirm_cache_size=100,
+        )
+        revocations.rebuild()
+        RevokedToken.objects.create(
+            jti="elsewhere", expires_at=timezone.now() + timedelta(hours=1)
+        )
+        revocations.built_at -= 3600
+        proceed = threading.Event()
+        build = revocations._build
+        revocations._build = lambda: proceed.wait(5) and build()
+
+        with self.assertNumQueries(0):
+            self.assertFalse(revocations.is_revoked("elsewhere"))
+        proceed.set()
+        with revocations._lock:
+            pass
+        self.assertTrue(revocations.is_revoked("elsewhere"))
+
+
+class LogoutTest(TestCase):
+    def setUp(self):
+        get_user_cache().clear()
+        get_revocation_list().clear()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            firstName="User",
+            lastName="One",
+            password="password123",
+        )
+        self.token = str(AccessToken.for_user(self.user))
+
+    def test_logout_revokes_token(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        url = reverse("user-detail", args=[self.user.userId])
+        self.assertEqual(client.get(url).status_code, 200)
+        self.assertEqual(client.post(reverse("logout")).status_code, 200)
+        response = client.get(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["code"], "token_revoked")
+
+        other = APIClient()
+        other.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.assertEqual(other.get(url).status_code, 200)
+
+    @override_settings(ROOT_URLCONF="users.async_urls")
+    def test_async_views_reject_revoked_token(self):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.token}"}
+        url = reverse("user-detail", args=[self.user.userId])
+        self.assertEqual(self.client.get(url, **headers).status_code, 200)
+        self.assertEqual(
+            self.client.post(reverse("logout"), **headers).status_code, 200
+        )
+        self.assertEqual(self.client.get(url, **headers).status_code, 401)
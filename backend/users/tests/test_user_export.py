@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.models import User
+from django.test import TestCase
+
+
+class UserExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com",
+            firstName="Admin",
+            lastName="User",
+            password="password123",
+        )
+        self.user = User.objects.create_user(
+            email="plain@example.com",
+            firstName="Plain",
+            lastName="User",
+            password="password123",
+            phone="555",
+        )
+        self.url = reverse("user-admin-export")
+
+    def test_ndjson_export_streams_every_user(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b"".join(response.streaming_content).decode()
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(
+            [r["email"] for r in rows], [self.admin.email, self.user.email]
+        )
+        self.assertEqual(rows[1]["userId"], str(self.user.userId))
+        self.assertNotIn("password", rows[1])
+
+    def test_csv_export(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"output": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+        body = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], ["userId", "firstName", "lastName", "email", "phone"])
+        self.assertEqual(rows[2][3:], ["plain@example.com", "555"])
+
+    def test_export_requires_admin(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_unknown_output_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"output": "xml"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,163 @@
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+def parse_rate(rate):
+    num, period = rate.split("/")
+    return int(num), {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+
+
+class TokenBucketLimiter:
+    """In-memory token buckets split across independently locked shards.
+
+    Each key refills at ``capacity / period`` tokens per second up to
+    ``capacity``. ``consume`` returns 0 when a token was available (taking
+    ``cost`` of it), otherwise the seconds until one is. Shards are
+    LRU-bounded so a spray of distinct keys cannot grow memory without limit.
+    """
+
+    def __init__(self, capacity, period, shards=16, max_keys=100000):
+        self.capacity = capacity
+        self.refill = capacity / period
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+
+    def _shard(self, key):
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def consume(self, key, cost=1):
+        lock, buckets = self._shard(key)
+        now = time.monotonic()
+        with lock:
+            tokens, updated = buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.refill)
+            if tokens >= 1:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.refill
+            buckets[key] = (tokens, now)
+            if len(buckets) > self.max_keys_per_shard:
+                buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        for lock, buckets in self._shards:
+            with lock:
+                buckets.clear()
+
+
+class CacheTokenBucketLimiter:
+    """Token buckets kept in a shared Django cache so all workers see them.
+
+    Reads and writes are not atomic, so concurrent workers may let a few
+    extra attempts through; that is acceptable for shedding abusive load.
+    Buckets carry the generation they were written under; ``clear`` bumps the
+    generation, since cache backends cannot delete keys by prefix.
+    """
+
+    def __init__(self, capacity, period, cache_alias, prefix="login-throttle"):
+        self.capacity = capacity
+        self.period = period
+        self.refill = capacity / period
+        self.cache = caches[cache_alias]
+        self.prefix = prefix
+        self.generation_key = f"{prefix}:generation"
+
+    def consume(self, key, cost=1):
+        cache_key = f"{self.prefix}:{key}"
+        now = time.time()
+        stored = self.cache.get_many([cache_key, self.generation_key])
+        generation = stored.get(self.generation_key, 0)
+        bucket = stored.get(cache_key)
+        if bucket is None or bucket[2:] != (generation,):
+            tokens, updated = self.capacity, now
+        else:
+            tokens, updated, _ = bucket
+        tokens = min(self.capacity, tokens + (now - updated) * self.refill)
+        if tokens >= 1:
+            tokens -= cost
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.refill
+        self.cache.set(cache_key, (tokens, now, generation), self.period)
+        return wait
+
+    def clear(self):
+        self.cache.add(self.generation_key, 0, None)
+        self.cache.incr(self.generation_key)
+
+
+_limiters = None
+
+
+def get_login_limiters():
+    global _limiters
+    if _limiters is None:
+        config = getattr(settings, "LOGIN_THROTTLE", {})
+        limiters = {}
+        for scope, default in (("email", "5/min"), ("ip", "30/min")):
+            capacity, period = parse_rate(config.get(f"{scope.upper()}_RATE", default))
+            if config.get("CACHE_ALIAS"):
+                limiters[scope] = CacheTokenBucketLimiter(
+                    capacity, period, config["CACHE_ALIAS"], f"login-throttle:{scope}"
+                )
+            else:
+                limiters[scope] = TokenBucketLimiter(
+                    capacity, period, shards=config.get("SHARDS", 16)
+                )
+        _limiters = limiters
+    return _limiters
+
+
+def _email_key(email):
+    if isinstance(email, str) and email.strip():
+        return f"email:{email.strip().lower()}"
+    return None
+
+
+def check_login(email, ident):
+    """Admit one login attempt; return 0 if allowed, else seconds to wait.
+
+    The attempt is charged to the client IP. The email bucket is only checked
+    here and charged by ``record_login_failure``, so successful logins cannot
+    be used to lock an account out.
+    """
+    if not getattr(settings, "LOGIN_THROTTLE", {}).get("ENABLED", True):
+        return 0.0
+    limiters = get_login_limiters()
+    waits = [limiters["ip"].consume(f"ip:{ident}")]
+    key = _email_key(email)
+    if key is not None:
+        waits.append(limiters["email"].consume(key, cost=0))
+    return max(waits)
+
+
+def record_login_failure(email):
+    """Charge a failed login to the email it was attempted against."""
+    key = _email_key(email)
+    if key is None or not getattr(settings, "LOGIN_THROTTLE", {}).get("ENABLED", True):
+        return
+    get_login_limiters()["email"].consume(key)
+
+
+class LoginThrottle(BaseThrottle):
+    """Reject login attempts by email and client IP before any password hashing.
+
+    The client IP is ``REMOTE_ADDR`` unless ``REST_FRAMEWORK["NUM_PROXIES"]``
+    says how many trusted proxies append to X-Forwarded-For.
+    """
+
+    def allow_request(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        self._wait = check_login(email, self.get_ident(request))
+        return not self._wait
+
+    def wait(self):
+        return self._wait
@@ -2,35 +2,54 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     UserRegistrationView,
+    BulkUserRegistrationView,
+    UserLogoutView,
+    SearchView,
     UserLoginView,
     UserDetailView,
     UserAdminView,
     OrganisationListCreateView,
     OrganisationDetailView,
     AddUserToOrganisationView,
+    BulkAddUsersToOrganisationView,
 )
 
 router = DefaultRouter()
 router.register(r"api/admin/users", UserAdminView, basename="user-admin")
 
-urlpatterns = [
-    path("", include(router.urls)),
-    path("auth/register", UserRegistrationView.as_view(), name="register"),
-    path("auth/login", UserLoginView.as_view(), name="login"),
-    path("api/users/<uuid:user_id>", UserDetailView.as_view(), name="user-detail"),
-    path(
-        "api/organisations",
-        OrganisationListCreateView.as_view(),
-        name="organisation-list-create",
-    ),
-    path(
+ROUTES = [
+    ("auth/register", UserRegistrationView, "register"),
+    ("auth/register/bulk", BulkUserRegistrationView, "register-bulk"),
+    ("auth/login", UserLoginView, "login"),
+    ("auth/logout", UserLogoutView, "logout"),
+    ("api/users/<uuid:user_id>", UserDetailView, "user-detail"),
+    ("api/search", SearchView, "search"),
+    ("api/organisations", OrganisationListCreateView, "organisation-list-create"),
+    (
         "api/organisations/<uuid:orgId>",
-        OrganisationDetailView.as_view(),
-        name="organisation-detail",
+        OrganisationDetailView,
+        "organisation-detail",
     ),
-    path(
+    (
         "api/organisations/<str:orgId>/users",
-        AddUserToOrganisationView.as_view(),
-        name="add-user-to-organisation",
+        AddUserToOrganisationView,
+        "add-user-to-organisation",
+    ),
+    (
+        "api/organisations/<uuid:orgId>/users/bulk",
+        BulkAddUsersToOrganisationView,
+        "bulk-add-users-to-organisation",
     ),
 ]
+
+
+def build_urlpatterns(overrides=None):
+    """The API routes, with the view for any route name in ``overrides`` swapped."""
+    overrides = overrides or {}
+    return [path("", include(router.urls))] + [
+        path(route, overrides.get(name) or view.as_view(), name=name)
+        for route, view, name in ROUTES
+    ]
+
+
+urlpatterns = build_urlpatterns()
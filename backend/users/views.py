@@ -1,18 +1,48 @@
+from django.conf import settings
 from django.db import IntegrityError
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
 from rest_framework import generics, status, viewsets
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from backend.db.routers import shard_for
 from .models import User, Organisation
 from .serializers import (
     UserSerializer,
     LoginSerializer,
     UserRegistrationSerializer,
+    BulkUserRegistrationSerializer,
     OrganisationSerializer,
     AddUserToOrganisationSerializer,
+    BulkAddUsersToOrganisationSerializer,
+    requested_fields,
+    sparse,
+)
+from .expansions import (
+    attach_members,
+    members_data,
+    members_window,
+    requested_expansions,
+)
+from .pagination import OrganisationCursorPagination
+from .exports import EXPORT_FORMATS, stream_users
+from .membership import Membership, add_member, add_members, get_membership_index
+from .throttling import LoginThrottle, record_login_failure
+from .revocation import get_revocation_list, token_expiry
+from .search import MIN_QUERY_LENGTH, SEARCH_TYPES
+from .projections import ORGANISATION_PROJECTION, USER_PROJECTION
+from .representations import (
+    get_organisation_entry,
+    get_user_entry,
+    organisation_entry,
+    user_entry,
+    user_representation,
 )
 
 
@@ -40,7 +70,7 @@ class UserRegistrationView(generics.CreateAPIView):
                 "message": "Registration successful",
                 "data": {
                     "accessToken": tokens["access"],
-                    "user": UserSerializer(user).data,
+                    "user": user_entry(user)["data"],
                 },
             }
             return Response(response_data, status=status.HTTP_201_CREATED)
@@ -55,8 +85,46 @@ class UserRegistrationView(generics.CreateAPIView):
             )
 
 
+class BulkUserRegistrationView(generics.GenericAPIView):
+    permission_classes = [IsAdminUser]
+    serializer_class = BulkUserRegistrationSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {
+                    "status": "Bad Request",
+                    "message": "Client error",
+                    "statusCode": 400,
+                    "errors": serializer.errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            users = serializer.save()
+        except IntegrityError:
+            return Response(
+                {
+                    "status": "Bad request",
+                    "message": "Registration unsuccessful",
+                    "statusCode": 400,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {
+                "status": "success",
+                "message": "Registration successful",
+                "data": {"users": [user_entry(user)["data"] for user in users]},
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class UserLoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginThrottle]
     serializer_class = LoginSerializer
 
     def post(self, request, *args, **kwargs):
@@ -69,10 +137,12 @@ class UserLoginView(APIView):
                 "message": "Login successful",
                 "data": {
                     "accessToken": tokens["access"],
-                    "user": UserSerializer(user).data,
+                    "user": user_representation(user),
                 },
             }
             return Response(response_data, status=status.HTTP_200_OK)
+        data = request.data
+        record_login_failure(data.get("email") if hasattr(data, "get") else None)
         return Response(
             {
                 "status": "Bad request",
@@ -83,61 +153,102 @@ class UserLoginView(APIView):
         )
 
 
+class UserLogoutView(APIView):
+    def post(self, request, *args, **kwargs):
+        token = request.auth
+        jti = token.get(api_settings.JTI_CLAIM) if token is not None else None
+        if jti is not None:
+            get_revocation_list().revoke(jti, token_expiry(token))
+        return Response(
+            {"status": "success", "message": "Logout successful"},
+            status=status.HTTP_200_OK,
+        )
+
+
 class UserAdminView(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAdminUser]
 
+    def list(self, request, *args, **kwargs):
+        projection = USER_PROJECTION.select(
+            requested_fields(request, USER_PROJECTION.fields)
+        )
+        queryset = projection.queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.render(page))
+        return Response(projection.render(queryset))
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        output = request.query_params.get("output", "ndjson")
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {
+                    "status": "Bad Request",
+                    "message": f"Unsupported export output: {output}",
+                    "statusCode": 400,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return stream_users(self.get_queryset(), output)
+
 
 class UserDetailView(APIView):
     def get(self, request, user_id, *args, **kwargs):
-        try:
-            user = User.objects.get(userId=user_id)
-            if (
-                request.user == user
-                or request.user.is_superuser
-                or request.user.is_staff
-                or Organisation.objects.filter(
-                    users=request.user, users__in=[user]
-                ).exists()
-            ):
-                serializer = UserSerializer(user)
-                return Response(
-                    {
-                        "status": "success",
-                        "message": "User record retrieved successfully",
-                        "data": serializer.data,
-                    },
-                    status=status.HTTP_200_OK,
-                )
-            else:
-                raise PermissionDenied(
-                    "You do not have permission to access this user's record."
-                )
-        except User.DoesNotExist:
+        entry = get_user_entry(user_id)
+        if entry is None:
             return Response(
                 {"status": "error", "message": "User not found", "statusCode": 404},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        if (
+            request.user.pk == entry["pk"]
+            or request.user.is_superuser
+            or request.user.is_staff
+            or get_membership_index().share_organisation(request.user.pk, entry["pk"])
+        ):
+            return Response(
+                {
+                    "status": "success",
+                    "message": "User record retrieved successfully",
+                    "data": sparse(
+                        entry["data"],
+                        requested_fields(request, UserSerializer.Meta.fields),
+                    ),
+                },
+                status=status.HTTP_200_OK,
+            )
+        raise PermissionDenied(
+            "You do not have permission to access this user's record."
+        )
 
 
 class OrganisationListCreateView(generics.ListCreateAPIView):
     serializer_class = OrganisationSerializer
+    pagination_class = OrganisationCursorPagination
 
     def get_queryset(self):
-        return Organisation.objects.all()
+        return Organisation.objects.filter(users=self.request.user.pk)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {
-                "status": "success",
-                "message": "Organisations retrieved successfully",
-                "data": {"organisations": serializer.data},
-            },
-            status=status.HTTP_200_OK,
+        if "members" in requested_expansions(request):
+            limit, offset = members_window(request)
+            page = self.paginate_queryset(self.get_queryset())
+            attach_members(page, limit, offset)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(
+                [
+                    {**data, **members_data(organisation)}
+                    for data, organisation in zip(serializer.data, page)
+                ]
+            )
+        projection = ORGANISATION_PROJECTION.select(
+            requested_fields(request, ORGANISATION_PROJECTION.fields)
         )
+        page = self.paginate_queryset(projection.queryset(self.get_queryset()))
+        return self.get_paginated_response(projection.render(page))
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -162,28 +273,97 @@ class OrganisationListCreateView(generics.ListCreateAPIView):
         )
 
 
+def get_member_organisation(org_id, user):
+    """The organisation, annotated with ``is_member`` for ``user``, or 404."""
+    queryset = Organisation.objects.using(shard_for(org_id)).annotate(
+        is_member=Exists(
+            Membership.objects.filter(organisation=OuterRef("pk"), user=user.pk)
+        )
+    )
+    return get_object_or_404(queryset, orgId=org_id)
+
+
+def get_organisation_detail(org_id, user):
+    """``(entry, is_member)`` for an organisation detail request.
+
+    The cached representation saves building the response body, but
+    membership is read from the database on every request: it decides access,
+    and other workers' membership writes do not reach this process.
+    """
+    entry = get_organisation_entry(org_id)
+    if entry is None:
+        organisation = get_member_organisation(org_id, user)
+        return organisation_entry(organisation), organisation.is_member
+    is_member = (
+        Membership.objects.using(shard_for(org_id))
+        .filter(organisation_id=entry["pk"], user_id=user.pk)
+        .exists()
+    )
+    return entry, is_member
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    return bool(if_none_match) and (
+        if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+    )
+
+
 class OrganisationDetailView(generics.RetrieveAPIView):
     serializer_class = OrganisationSerializer
     lookup_field = "orgId"
 
     def get_queryset(self):
-        return Organisation.objects.filter(users=self.request.user)
+        return Organisation.objects.filter(users=self.request.user.pk)
+
+    def get_member_object(self, org_id):
+        return get_member_organisation(org_id, self.request.user)
+
+    def forbidden(self):
+        return Response(
+            {
+                "detail": "You do not have permission to access this organization's data."
+            },
+            status=status.HTTP_403_FORBIDDEN,
+        )
 
     def retrieve(self, request, *args, **kwargs):
-        organisation = get_object_or_404(Organisation, orgId=kwargs["orgId"])
-        if not organisation.users.filter(id=request.user.id).exists():
-            return Response(
-                {
-                    "detail": "You do not have permission to access this organization's data."
-                },
-                status=status.HTTP_403_FORBIDDEN,
-            )
-        serializer = self.get_serializer(organisation)
+        if "members" in requested_expansions(request):
+            return self.retrieve_expanded(request, kwargs["orgId"])
+        entry, is_member = get_organisation_detail(kwargs["orgId"], request.user)
+        if not is_member:
+            return self.forbidden()
+        etag = entry["etag"]
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
         return Response(
             {
                 "status": "success",
                 "message": "Organisation retrieved successfully",
-                "data": serializer.data,
+                "data": sparse(
+                    entry["data"],
+                    requested_fields(request, OrganisationSerializer.Meta.fields),
+                ),
+            },
+            status=status.HTTP_200_OK,
+            headers={"ETag": etag},
+        )
+
+    def retrieve_expanded(self, request, org_id):
+        # Member pages change without touching updated_at, so no ETag here.
+        limit, offset = members_window(request)
+        organisation = self.get_member_object(org_id)
+        if not organisation.is_member:
+            return self.forbidden()
+        attach_members([organisation], limit, offset)
+        return Response(
+            {
+                "status": "success",
+                "message": "Organisation retrieved successfully",
+                "data": {
+                    **self.get_serializer(organisation).data,
+                    **members_data(organisation),
+                },
             },
             status=status.HTTP_200_OK,
         )
@@ -196,11 +376,10 @@ class AddUserToOrganisationView(generics.GenericAPIView):
     def post(self, request, orgId):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            organisation = get_object_or_404(Organisation, orgId=orgId)
-            user = get_object_or_404(User, userId=serializer.validated_data["userId"])
-
-            organisation.users.add(user)
-            organisation.save()
+            organisation = get_object_or_404(
+                Organisation.objects.using(shard_for(orgId)), orgId=orgId
+            )
+            add_member(organisation, serializer.validated_data["user"])
 
             return Response(
                 {
@@ -219,3 +398,83 @@ class AddUserToOrganisationView(generics.GenericAPIView):
             },
             status=status.HTTP_400_BAD_REQUEST,
         )
+
+
+class BulkAddUsersToOrganisationView(generics.GenericAPIView):
+    serializer_class = BulkAddUsersToOrganisationSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, orgId):
+        organisation = get_member_organisation(orgId, request.user)
+        if not (
+            organisation.is_member or request.user.is_staff or request.user.is_superuser
+        ):
+            raise PermissionDenied(
+                "You do not have permission to add users to this organisation."
+            )
+        serializer = self.get_serializer(data=request.data)
+        if serializer.is_valid():
+            results = add_members(organisation, serializer.validated_data["userIds"])
+            return Response(
+                {
+                    "status": "success",
+                    "message": "Users processed for organisation",
+                    "data": {"results": results},
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        return Response(
+            {
+                "status": "Bad Request",
+                "message": "Client error",
+                "statusCode": 400,
+                "errors": serializer.errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class SearchView(APIView):
+    def get(self, request, *args, **kwargs):
+        config = getattr(settings, "SEARCH", {})
+        query = request.query_params.get("q", "").strip()
+        kinds = request.query_params.get("type") or ",".join(SEARCH_TYPES)
+        kinds = [kind.strip() for kind in kinds.split(",") if kind.strip()]
+        errors = {}
+        if len(query) < MIN_QUERY_LENGTH:
+            errors["q"] = [
+                f"Ensure this field has at least {MIN_QUERY_LENGTH} characters."
+            ]
+        unknown = [kind for kind in kinds if kind not in SEARCH_TYPES]
+        if unknown or not kinds:
+            errors["type"] = [f"Choose from: {', '.join(SEARCH_TYPES)}."]
+        try:
+            limit = int(
+                request.query_params.get("limit", config.get("DEFAULT_LIMIT", 20))
+            )
+        except ValueError:
+            errors["limit"] = ["A valid integer is required."]
+        if errors:
+            return Response(
+                {
+                    "status": "Bad Request",
+                    "message": "Client error",
+                    "statusCode": 400,
+                    "errors": errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limit = min(max(limit, 1), config.get("MAX_LIMIT", 100))
+        return Response(
+            {
+                "status": "success",
+                "message": "Search results retrieved successfully",
+                "data": {
+                    kind: SEARCH_TYPES[kind](request.user, query, limit)
+                    for kind in kinds
+                },
+            },
+            status=status.HTTP_200_OK,
+        )